@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Import cost per CLI subcommand, measured with `python -X importtime`
+
+    python bench/import_time.py [--repeat 5]
+
+"eager" imports the modules fiverr_keeper_sb.py used to load at module level,
+i.e. what every invocation paid before imports were made lazy.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+KEEPER = os.path.join(ROOT, "fiverr_keeper_sb.py")
+
+CASES = {
+    "--help": [KEEPER, "--help"],
+    "validate-config": [KEEPER, "validate-config"],
+    "status": [KEEPER, "status"],
+    "run (imports only)": ["-c", "import fiverr_keeper_sb, seleniumbase, bs4, psutil, smtplib, "
+                                 "requests, keeper_keepalive"],
+    "eager (old layout)": ["-c", "import smtplib, requests, psutil, subprocess, email.message, bs4, "
+                                 "dotenv, seleniumbase, seleniumbase.undetected"],
+}
+
+
+def total_import_us(stderr):
+    """Sum of cumulative times of top-level imports in -X importtime output."""
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith(" ") or name.startswith("  "):
+            continue  # nested import, already counted by its parent
+        total += int(cumulative)
+    return total
+
+
+def measure(args):
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime"] + args, cwd=ROOT,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    wall = time.perf_counter() - start
+    return total_import_us(proc.stderr) / 1000.0, wall * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time per subcommand")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'case':<22} {'imports ms':>11} {'wall ms':>9}   (median of {args.repeat})")
+    for name, case in CASES.items():
+        runs = [measure(case) for _ in range(args.repeat)]
+        imports = statistics.median(r[0] for r in runs)
+        wall = statistics.median(r[1] for r in runs)
+        print(f"{name:<22} {imports:>11.1f} {wall:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Renderer CPU: legacy window-scanning keepalive vs the constructor hook
+
+    python bench/keepalive_cpu.py                      # synthetic SPA-sized page
+    python bench/keepalive_cpu.py --url https://www.fiverr.com/seller_dashboard --profile ~/.config/fiverr_profiles
+
+Each variant gets a fresh tab load, runs at --interval-ms (short, to amplify the
+per-tick cost) and is measured over --seconds with psutil (renderer processes)
+and CDP Performance.getMetrics (ScriptDuration/TaskDuration of the tab).
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from seleniumbase import SB
+
+from keeper_keepalive import keepalive_source, keepalive_stats, measure_renderer_cpu
+
+# Roughly what a heavy SPA leaves on window: thousands of globals, a couple of sockets
+SYNTHETIC_PAGE = """data:text/html,<html><body><script>
+for (let i = 0; i < 8000; i++) { window['g' + i] = {i: i, s: 'x'.repeat(16)}; }
+function open() { try { return new WebSocket('wss://echo.websocket.org/'); } catch (e) { return null; } }
+(function () { const hidden = open(); window.__keep = [hidden]; })();
+window.visibleSocket = open();
+</script></body></html>"""
+
+
+def run_variant(sb, url, legacy, interval_ms, seconds):
+    driver = sb.driver
+    # New tab per variant so neither script survives into the other's measurement
+    driver.switch_to.new_window("tab")
+    source = keepalive_source(interval_ms, legacy=legacy)
+    if legacy:
+        driver.get(url)
+        time.sleep(3)
+        driver.execute_script(source)
+    else:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+        driver.get(url)
+        time.sleep(3)
+    result = measure_renderer_cpu(driver, seconds)
+    result["stats"] = None if legacy else keepalive_stats(driver)
+    driver.close()
+    driver.switch_to.window(driver.window_handles[0])
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default=SYNTHETIC_PAGE)
+    parser.add_argument("--profile", default=None, help="user-data-dir (for a logged-in dashboard)")
+    parser.add_argument("--interval-ms", type=int, default=1000)
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--headless", action="store_true")
+    args = parser.parse_args()
+
+    with SB(uc=True, headless=args.headless, user_data_dir=args.profile, block_images=True) as sb:
+        before = run_variant(sb, args.url, True, args.interval_ms, args.seconds)
+        after = run_variant(sb, args.url, False, args.interval_ms, args.seconds)
+
+    print(f"interval={args.interval_ms}ms window={args.seconds}s")
+    print(f"{'variant':<10} {'renderer cpu s':>15} {'cpu %':>7} {'script s':>9} {'task s':>8}")
+    for name, r in (("legacy", before), ("hook", after)):
+        print(f"{name:<10} {r['renderer_cpu']:>15.3f} {r['renderer_cpu_pct']:>7.2f} "
+              f"{r['script']:>9.3f} {r['task']:>8.3f}")
+    if after["stats"]:
+        print("hook registry:", {k: after["stats"][k] for k in ("sockets", "open", "connecting", "pings")})
+
+
+if __name__ == "__main__":
+    main()
@@ -5,116 +5,157 @@ Fiverr Keeper VPS Version (Linux Compatible)
 - Persistent user-data-dir so PX solved challenge persists
 - Handles headless mode for VPS
 - Takes screenshots, checks unread counters
+- Dashboard tab stays live for presence; a separate worker tab polls the counters
 - Sends email & optional Telegram alerts on new unreads
+- CLI: run (default), check-once, status, test-alert, validate-config, latency
+
+Heavy modules (seleniumbase, bs4, requests, smtplib, psutil) are imported
+inside the functions that use them, so one-shot commands stay fast.
 """
 
 import os
+import sys
 import time
 import json
 import traceback
-import smtplib
-import requests
-import os, sys, psutil, subprocess
-from email.message import EmailMessage
-from bs4 import BeautifulSoup
+import queue
+import threading
+from typing import Optional
 # from selenium.common.exceptions import WebDriverException
-from dotenv import load_dotenv
-from seleniumbase import SB, Driver
-from seleniumbase.undetected import Chrome
+from keeper_config import ConfigManager, ConfigError, write_json_atomic
+from keeper_collector import DashboardCollector
+from keeper_cookies import CookieSync, inject_cookies
+from keeper_challenge import ChallengeStats, ChallengeUnresolved, ensure_no_challenge
+from keeper_latency import LatencyTracker, message_timestamp
+from keeper_recovery import RecoveryManager, RestartDriver
+from keeper_tabs import TabManager
+from keeper_telegram import format_status
 
 # ----------------------------------------------------------
-# Load environment
+# Load configuration (.env / KEEPER_CONFIG_FILE, reloadable via SIGHUP)
 # ----------------------------------------------------------
-load_dotenv()
-
-COOKIES_FILE = os.getenv("COOKIES_FILE", "cookies.json")
-FIVERR_DASH = os.getenv("FIVERR_DASH", "https://www.fiverr.com/seller_dashboard")
-NOTIF_URL = "https://www.fiverr.com/notification_items/unread_count"
-INBOX_URL = "https://www.fiverr.com/inbox/counters/unread"
-
-HEADLESS = os.getenv("HEADLESS", "true").lower() in ("1", "true", "yes", "y")
-HEARTBEAT_INTERVAL = int(os.getenv("HEARTBEAT_INTERVAL", "10"))
-REFRESH_INTERVAL_HOURS = float(os.getenv("REFRESH_INTERVAL_HOURS", "3"))
-PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.expanduser("~/.config/fiverr_profiles"))
-SCREENSHOT_DIR = os.getenv("SCREENSHOT_DIR", "./screenshots")
-
-# Email config
-SMTP_HOST = os.getenv("SMTP_HOST")
-SMTP_PORT = os.getenv("SMTP_PORT")
-SMTP_FROM = os.getenv("SMTP_FROM")
-SMTP_TO = os.getenv("SMTP_TO")
-SMTP_USER = os.getenv("SMTP_USER")
-SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
-SMTP_USE_SSL = os.getenv("SMTP_USE_SSL", "true").lower() in ("1", "true", "yes", "y")
-SMTP_USE_TLS = os.getenv("SMTP_USE_TLS", "false").lower() in ("1", "true", "yes", "y")
-
-# Telegram (optional)
-TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
-TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+NOTIF_PATH = "/notification_items/unread_count"
+INBOX_PATH = "/inbox/counters/unread"
+
+# Set by the Telegram hooks and SIGHUP to cut the heartbeat wait short
+wake_event = threading.Event()
+config = ConfigManager(wake=wake_event)
+
+
+def fiverr_url(path="/"):
+    """Absolute URL under FIVERR_BASE (a local stand-in in soak mode)."""
+    return config.current.fiverr_base + path
+
 
 last_alert_unreads = 0
 
+# Cached state shared with the Telegram command thread (never touches the driver)
+status = {
+    "started": time.time(),
+    "paused": False,
+    "notif": None,
+    "msgs": None,
+    "last_poll": None,
+    "last_ok": None,
+    "last_error": None,
+    "consecutive_errors": 0,
+    "keepalive": None,
+    "challenges": None,
+    "recovery": None,
+    "tabs": None,
+    "latency": None,
+}
+resume_event = threading.Event()
+resume_event.set()
+screenshot_requests = queue.Queue()
+challenge_stats = ChallengeStats()
+telegram_session = None
+telegram_bot = None
+tabs = None
+latency = LatencyTracker()
+last_inbox_payload = None
+
 
 # ----------------------------------------------------------
 # Notification functions
 # ----------------------------------------------------------
-def send_email_notification(subject: str, body: str) -> None:
+def send_email_notification(subject: str, body: str) -> Optional[bool]:
+    """True once the SMTP server accepted the message, False on failure, None if not configured."""
+    import smtplib
+    from email.message import EmailMessage
+
     print(body)
-    if not (SMTP_HOST and SMTP_PORT and SMTP_FROM and SMTP_TO):
+    cfg = config.current
+    if not cfg.smtp_configured:
         print("[email] SMTP not configured, skipping:", subject)
-        return
+        return None
     try:
         msg = EmailMessage()
-        msg["From"] = SMTP_FROM
-        msg["To"] = SMTP_TO
+        msg["From"] = cfg.smtp_from
+        msg["To"] = cfg.smtp_to
         msg["Subject"] = subject
         msg.set_content(body)
-        port_i = int(SMTP_PORT)
-        if SMTP_USE_SSL:
-            with smtplib.SMTP_SSL(SMTP_HOST, port_i) as smtp:
-                if SMTP_USER and SMTP_PASSWORD:
-                    smtp.login(SMTP_USER, SMTP_PASSWORD)
+        port_i = cfg.smtp_port
+        if cfg.smtp_use_ssl:
+            with smtplib.SMTP_SSL(cfg.smtp_host, port_i) as smtp:
+                if cfg.smtp_user and cfg.smtp_password:
+                    smtp.login(cfg.smtp_user, cfg.smtp_password)
                 smtp.send_message(msg)
         else:
-            with smtplib.SMTP(SMTP_HOST, port_i) as smtp:
+            with smtplib.SMTP(cfg.smtp_host, port_i) as smtp:
                 smtp.ehlo()
-                if SMTP_USE_TLS:
+                if cfg.smtp_use_tls:
                     smtp.starttls()
-                if SMTP_USER and SMTP_PASSWORD:
-                    smtp.login(SMTP_USER, SMTP_PASSWORD)
+                if cfg.smtp_user and cfg.smtp_password:
+                    smtp.login(cfg.smtp_user, cfg.smtp_password)
                 smtp.send_message(msg)
         print("[email] Sent:", subject)
+        return True
     except Exception as e:
         print("[email] Failed:", e)
+        return False
 
 
 def notify_telegram(text):
-    if not (TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID):
-        return
+    """Same contract as send_email_notification: True accepted, False failed, None off."""
+    cfg = config.current
+    if not cfg.telegram_configured:
+        return None
     try:
-        url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-        requests.post(url, data={"chat_id": TELEGRAM_CHAT_ID, "text": text})
+        global telegram_session
+        if telegram_session is None:
+            from keeper_telegram import make_session
+            telegram_session = make_session()
+        url = f"{cfg.telegram_api_base.rstrip('/')}/bot{cfg.telegram_bot_token}/sendMessage"
+        resp = telegram_session.post(url, data={"chat_id": cfg.telegram_chat_id, "text": text}, timeout=(5, 15))
+        resp.raise_for_status()
         print("[telegram] notified")
+        return True
     except Exception as e:
         print("[telegram] failed:", e)
+        return False
 
 
 # ----------------------------------------------------------
 # Helper functions
 # ----------------------------------------------------------
 def save_screenshot(driver, prefix="fiverr"):
-    os.makedirs(SCREENSHOT_DIR, exist_ok=True)
+    screenshot_dir = config.current.screenshot_dir
+    os.makedirs(screenshot_dir, exist_ok=True)
     ts = int(time.time())
-    path = os.path.join(SCREENSHOT_DIR, f"{prefix}_{ts}.png")
+    path = os.path.join(screenshot_dir, f"{prefix}_{ts}.png")
     try:
         driver.save_screenshot(path)
         print("[screenshot] saved:", path)
+        return path
     except Exception as e:
         print("[screenshot] failed:", e)
+        return None
 
 
 def extract_json_from_page_source(src_text):
     try:
+        from bs4 import BeautifulSoup
         soup = BeautifulSoup(src_text, "html.parser")
         pre = soup.find("pre")
         if pre and pre.get_text().strip().startswith("{"):
@@ -131,11 +172,19 @@ def extract_json_from_page_source(src_text):
 def load_cookies(driver):
     # We will not forcibly add cookies if using user-data-dir profile,
     # but we still support loading cookies.json if present (for first-run)
-    if os.path.exists(COOKIES_FILE):
+    cookies_file = config.current.cookies_file
+    if os.path.exists(cookies_file):
         print("[cookies] cookies.json found. Adding cookies into profile (may override).")
-        driver.get("https://www.fiverr.com/")
-        with open(COOKIES_FILE, "r", encoding="utf-8") as f:
+        with open(cookies_file, "r", encoding="utf-8") as f:
             cookies = json.load(f)
+        try:
+            # One CDP call, no navigation; the next page load picks them up
+            inject_cookies(driver, cookies)
+            print("[cookies] injected", len(cookies), "cookies over CDP.")
+            return
+        except Exception as e:
+            print("[cookies] CDP injection failed, falling back to add_cookie:", e)
+        driver.get(fiverr_url())
         for c in cookies:
             cookie = {k: v for k, v in c.items() if v is not None}
             if "expirationDate" in cookie:
@@ -154,6 +203,194 @@ def load_cookies(driver):
         print("[cookies] cookies.json not found — relying on profile data if present.")
 
 
+def check_challenge(sb, where, raise_unresolved=False):
+    """
+    Handle a PX/Turnstile challenge on the current page, only if one is present.
+    A challenge that survives UC handling returns None (the recovery ladder takes
+    over), or raises ChallengeUnresolved with raise_unresolved=True.
+    """
+    url = fiverr_url()
+    session_tabs = tabs if where != "startup" else None
+    if session_tabs:
+        # UC reconnect replaces the focused tab; that must never be the dashboard
+        try:
+            session_tabs.worker()
+        except Exception as e:
+            print("[tabs] worker tab unavailable before challenge check:", e)
+    if where != "startup":
+        try:
+            url = sb.driver.current_url
+        except Exception:
+            pass
+    handled = False
+    try:
+        marker = ensure_no_challenge(sb, url, challenge_stats, where)
+        handled = bool(marker)
+    except ChallengeUnresolved as e:
+        handled = True
+        print("[challenge]", e)
+        marker = None
+        if raise_unresolved:
+            raise
+    finally:
+        status["challenges"] = challenge_stats.summary()
+        if handled and session_tabs:
+            session_tabs.after_reconnect()
+    if marker:
+        print("[challenge] stats:", status["challenges"])
+    return marker
+
+
+def deliver_unread_alert(subject, body, prev_ok, detected, msgs_rose, cfg):
+    """Send through every channel, timing each; unreads seen on a session's first poll aren't timed."""
+    record = None
+    if prev_ok is not None:
+        # The inbox timestamp only dates this rise if messages rose and it falls in the poll gap
+        msg_ts = message_timestamp(last_inbox_payload) if msgs_rose else None
+        if msg_ts and prev_ok <= msg_ts <= detected:
+            record = latency.begin(msg_ts, detected, "message_ts")
+        else:
+            record = latency.begin(prev_ok, detected, "counter")
+
+    for name, send in (("email", lambda: send_email_notification(subject, body)),
+                       ("telegram", lambda: notify_telegram(body))):
+        start = time.time()
+        ok = send()
+        if record is not None and ok is not None:
+            latency.channel(record, name, start, ok)
+
+    if record is not None:
+        latency.finish(record, cfg)
+        status["latency"] = latency.short_summary(cfg)
+
+
+def send_alert(subject, body):
+    send_email_notification(subject, body)
+    notify_telegram(body)
+
+
+collector = DashboardCollector(alert=send_alert)
+
+
+def run_collector(driver, cfg):
+    """Slow-schedule dashboard collection; uses the page already loaded, never navigates."""
+    if not collector.due(cfg):
+        return
+    try:
+        collector.collect(driver, cfg)
+    except Exception as e:
+        print("[collector] failed:", e)
+
+
+cookie_sync = CookieSync()
+
+
+def run_cookie_sync(driver, cfg):
+    """Write refreshed session cookies back to COOKIES_FILE when they matter."""
+    if not cookie_sync.due(cfg):
+        return
+    try:
+        cookie_sync.sync(driver, cfg)
+    except Exception as e:
+        print("[cookies] sync failed:", e)
+
+
+def log_keepalive(driver):
+    from keeper_keepalive import keepalive_stats, format_keepalive
+
+    try:
+        stats = keepalive_stats(driver)
+    except Exception as e:
+        print("[keepalive] stats unavailable:", e)
+        return None
+    status["keepalive"] = format_keepalive(stats)
+    print("[keepalive]", status["keepalive"])
+    return stats
+
+
+# ----------------------------------------------------------
+# Telegram command hooks (run on the bot thread)
+# ----------------------------------------------------------
+def pause_polling():
+    status["paused"] = True
+    resume_event.clear()
+    wake_event.set()
+    print("[control] polling paused")
+
+
+def resume_polling():
+    status["paused"] = False
+    resume_event.set()
+    wake_event.set()
+    print("[control] polling resumed")
+
+
+def request_screenshot():
+    screenshot_requests.put(time.time())
+    wake_event.set()
+
+
+def start_telegram_bot(after=()):
+    from keeper_telegram import TelegramBot
+
+    global telegram_bot
+    cfg = config.current
+    if not (cfg.telegram_commands and cfg.telegram_configured):
+        return None
+    telegram_bot = TelegramBot(
+        cfg.telegram_bot_token,
+        cfg.telegram_chat_id,
+        status_provider=lambda: format_status(status),
+        on_screenshot=request_screenshot,
+        on_pause=pause_polling,
+        on_resume=resume_polling,
+        api_base=cfg.telegram_api_base,
+    )
+    telegram_bot.start(after)
+    return telegram_bot
+
+
+def stop_telegram_bot():
+    """Returns the old bot's threads; the process exiting ends them anyway."""
+    global telegram_bot
+    threads = []
+    if telegram_bot:
+        threads = telegram_bot.stop()
+        telegram_bot = None
+    return threads
+
+
+def on_config_change(old, new, changed):
+    """Apply settings that live outside the per-poll config lookups."""
+    global telegram_session
+    if changed & {"telegram_bot_token", "telegram_chat_id", "telegram_api_base", "telegram_commands"}:
+        print("[config] restarting Telegram command interface")
+        # The new bot waits for the old long poll to finish before its own getUpdates
+        start_telegram_bot(after=stop_telegram_bot())
+        if telegram_session:
+            telegram_session.close()
+            telegram_session = None
+
+
+def handle_screenshot_requests(driver):
+    """Capture queued /screenshot requests on the main thread; the bot uploads them."""
+    if screenshot_requests.empty():
+        return
+    while not screenshot_requests.empty():
+        screenshot_requests.get_nowait()
+    # Capture the presence tab (what a /screenshot user wants to see), then back to work
+    if tabs:
+        driver = tabs.dashboard()
+    path = save_screenshot(driver, "telegram")
+    if tabs:
+        tabs.worker()
+    if telegram_bot:
+        if path:
+            telegram_bot.queue_photo(path, caption=time.ctime())
+        else:
+            telegram_bot.queue_message("Screenshot failed, see keeper logs.")
+
+
 # ----------------------------------------------------------
 # Browser setup (SeleniumBase UC Mode)
 # ----------------------------------------------------------
@@ -204,38 +441,108 @@ def load_cookies(driver):
 # ----------------------------------------------------------
 # Core logic
 # ----------------------------------------------------------
+# How often a heartbeat wait checks the config file for edits
+CONFIG_CHECK_SECONDS = 5
+
+
+def wait_for_next_poll(timeout):
+    """Heartbeat sleep that returns early for Telegram commands, SIGHUP or a config file edit."""
+    deadline = time.time() + timeout
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return
+        if wake_event.wait(min(remaining, CONFIG_CHECK_SECONDS)):
+            wake_event.clear()
+            return
+        if config.file_changed():
+            return
+
+
 def get_unread_counts(driver):
-    driver.get(NOTIF_URL)
+    global last_inbox_payload
+    driver.get(fiverr_url(NOTIF_PATH))
     time.sleep(1)
     notif_json = extract_json_from_page_source(driver.page_source)
     notif = json.loads(notif_json) if notif_json else {}
     n = int(notif.get("count", 0))
 
-    driver.get(INBOX_URL)
+    driver.get(fiverr_url(INBOX_PATH))
     time.sleep(1)
     inbox_json = extract_json_from_page_source(driver.page_source)
     inbox = json.loads(inbox_json) if inbox_json else {}
     m = int(inbox.get("count", 0))
+    last_inbox_payload = inbox
 
     return n, m
 
 
-def is_process_running(keyword):
+def is_process_running(keyword, exclude=()):
+    import psutil
+
     for proc in psutil.process_iter(["pid", "cmdline"]):
-        cmd = " ".join(proc.info.get("cmdline", [])).lower()
-        if keyword in cmd and proc.pid != os.getpid():
+        args = proc.info.get("cmdline") or []
+        cmd = " ".join(args).lower()
+        if keyword in cmd and proc.pid != os.getpid() and not any(a in exclude for a in args):
             return True
     return False
 
 
+def write_status_file():
+    """Snapshot of the cached status for `fiverr_keeper_sb.py status`."""
+    try:
+        write_json_atomic(config.current.status_file, dict(status, pid=os.getpid(), written=time.time()))
+    except Exception as e:
+        print("[status] write failed:", e)
+
+
+def open_browser(cfg):
+    """SeleniumBase UC context shared by `run` and `check-once`."""
+    from seleniumbase import SB
+
+    os.environ["SB_HEADLESS_MODE"] = "1" if cfg.headless else "0"
+    os.environ["DISPLAY"] = ":99"
+    return SB(uc=True,
+              headless=cfg.headless,  # Respect your env var
+              xvfb=True,  # Run in virtual display
+              block_images=True,  # Saves network and memory
+              incognito=False,
+              disable_csp=True,  # Prevents CSP issues
+              ad_block_on=True,  # Reduce background ad activity
+              swiftshader=True,  # Use software rendering (lighter)
+              user_data_dir=cfg.profile_dir,
+              # Background-tab flags keep the dashboard tab's timers running while the worker tab is active
+              chromium_arg="--no-sandbox --disable-dev-shm-usage --disable-gpu --remote-debugging-port=9222 --mute-audio --window-size=1280,800 "
+                           "--disable-background-timer-throttling --disable-renderer-backgrounding",
+              # chromium_arg=(
+              #     "--no-sandbox "
+              #     "--disable-gpu "
+              #     "--disable-dev-shm-usage "
+              #     "--mute-audio "
+              #     "--disable-background-timer-throttling "
+              #     "--disable-extensions "
+              #     "--disable-software-rasterizer "
+              #     "--disable-backgrounding-occluded-windows "
+              #  ),
+              # disable_features="TranslateUI,BlinkGenPropertyTrees",
+              # start_page="https://www.fiverr.com/",
+              # window_size="1280,800",
+              agent="Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+                    "(KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36", )
+
+
+# Upper bound for the backoff between failed driver relaunches
+MAX_RELAUNCH_BACKOFF = 600
+
+
 def main():
     # for proc in psutil.process_iter(["pid", "name", "cmdline"]):
     #     if "fiverr_keeper_sb.py" in " ".join(proc.info.get("cmdline", [])) and proc.pid != os.getpid():
     #         print("Another Fiverr bot is already running — exiting.")
     #         sys.exit(0)
 
-    # Prevent duplicate bot
-    if is_process_running("fiverr_keeper_sb.py"):
+    # Prevent duplicate bot (one-shot CLI commands don't count)
+    if is_process_running("fiverr_keeper_sb.py", exclude=ONE_SHOT_COMMANDS):
         print("Another Fiverr bot is already running — exiting.")
         sys.exit(0)
 
@@ -248,105 +555,44 @@ def main():
     #         "--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu"
     #     ])
     #     print("[info] Started new Chrome instance on port 9222")
-    global last_alert_unreads
+    cfg = load_config_or_exit()
+    config.install_sighup()
+    config.listeners.append(on_config_change)
+
     driver = None
+    recovery = RecoveryManager(cfg.recovery_tiers, {}, max_wait=cfg.poll_error_sleep)
+    restarted = False
+    failed_relaunches = 0
+    start_telegram_bot()
     try:
-        os.environ["SB_HEADLESS_MODE"] = "1" if HEADLESS else "0"
-        os.environ["DISPLAY"] = ":99"
-        # driver = setup_driver()
-        with SB(uc=True,
-                headless=HEADLESS,  # Respect your env var
-                xvfb=True,  # Run in virtual display
-                block_images=True,  # Saves network and memory
-                incognito=False,
-                disable_csp=True,  # Prevents CSP issues
-                ad_block_on=True,  # Reduce background ad activity
-                swiftshader=True,  # Use software rendering (lighter)
-                user_data_dir=PROFILE_DIR,
-                chromium_arg="--no-sandbox --disable-dev-shm-usage --disable-gpu --remote-debugging-port=9222 --mute-audio --window-size=1280,800",
-                # chromium_arg=(
-                #     "--no-sandbox "
-                #     "--disable-gpu "
-                #     "--disable-dev-shm-usage "
-                #     "--mute-audio "
-                #     "--disable-background-timer-throttling "
-                #     "--disable-extensions "
-                #     "--disable-software-rasterizer "
-                #     "--disable-backgrounding-occluded-windows "
-                #  ),
-                # disable_features="TranslateUI,BlinkGenPropertyTrees",
-                # start_page="https://www.fiverr.com/",
-                # window_size="1280,800",
-                agent="Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-                      "(KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36", ) as sb:
-
-
-            driver = sb.driver
-            # sb.uc_gui_press_key()
-            sb.uc_open_with_reconnect("https://www.fiverr.com/", 4)
-            sb.uc_gui_handle_captcha()
-            print("[driver] started. Profile dir:", PROFILE_DIR)
-            # driver.get("https://www.fiverr.com/")
-            time.sleep(2)
-            load_cookies(sb.driver)
-            # driver
-            sb.get(FIVERR_DASH)
-
-            time.sleep(1)
-            sb.execute_script("""
-                setInterval(() => {
-                    if (window.WebSocket) {
-                         const sockets = [];
-                         for (let k in window) {
-                          if (window[k] instanceof WebSocket) sockets.push(window[k]);
-                         }
-                  sockets.forEach(s => {
-                      if (s.readyState === 1) s.send('ping');
-                     });
-                 }
-                }, 50000); // every 50 seconds
-            """)
-            save_screenshot(sb.driver, "startup")
-
+        while True:
+            started = False
             try:
-                n, m = get_unread_counts(sb.driver)
-                print("[init] notif:", n, "msgs:", m)
+                # driver = setup_driver()
+                with open_browser(cfg) as sb:
+                    driver = sb.driver
+                    recovery.actions = recovery_actions(sb)
+                    start_session(sb, cfg)
+                    started = True
+                    failed_relaunches = 0
+                    poll_loop(sb, recovery)
+            except RestartDriver:
+                # Same profile, so the solved challenge and session survive
+                print("[recovery] restarting driver on the same profile")
+                restarted = True
             except Exception as e:
-                save_screenshot(sb.driver, "initial_check_failed")
-                raise Exception("Initial unread check failed: " + repr(e))
-
-            last_refresh = time.time()
-
-            while True:
-                try:
-                    n, m = get_unread_counts(sb.driver)
-                    total = n + m
-                    print("[poll] notif:", n, "msgs:", m, "total:", total)
-
-                    if total == 0 and last_alert_unreads != 0:
-                        print("[tracker] all read -> reset last_alert_unreads")
-                        last_alert_unreads = 0
-
-                    if total > last_alert_unreads:
-                        subject = "Fiverr: New notifications/messages"
-                        body = f"Unread Notifications: {n}\nUnread Messages: {m}\nTotal: {total}\nTime: {time.ctime()}"
-                        send_email_notification(subject, body)
-                        notify_telegram(body)
-                        last_alert_unreads = total
-
-                    if time.time() - last_refresh >= REFRESH_INTERVAL_HOURS * 3600:
-                        print("[refresh] refreshing dashboard to keep WS alive")
-                        sb.get(FIVERR_DASH)
-                        time.sleep(4)
-                        save_screenshot(sb.driver, "refresh")
-                        last_refresh = time.time()
-
-                    time.sleep(HEARTBEAT_INTERVAL)
-                except Exception as inner:
-                    save_screenshot(sb.driver, "poll_error")
-                    print("[loop error]", inner)
-                    traceback.print_exc()
-                    time.sleep(10)
+                # Only the first launch is fatal; a relaunch that fails to come up is retried
+                if started or not restarted:
+                    raise
+                failed_relaunches += 1
+                wait = min(cfg.poll_error_sleep * 2 ** failed_relaunches, MAX_RELAUNCH_BACKOFF)
+                print(f"[recovery] relaunch #{failed_relaunches} failed ({e!r:.200}), retrying in {wait:.0f}s")
+                status.update(last_error=repr(e)[:200])
+                write_status_file()
+                time.sleep(wait)
+            driver = None
+            cfg = config.current
+            recovery.restart_done()
     except Exception as e:
         tb = traceback.format_exc()
         print("[fatal]", e)
@@ -357,6 +603,7 @@ def main():
         notify_telegram(f"Fiverr Keeper fatal error: {e}")
         raise
     finally:
+        stop_telegram_bot()
         if driver:
             try:
                 driver.quit()
@@ -364,5 +611,243 @@ def main():
                 pass
 
 
+def start_session(sb, cfg):
+    global tabs
+    # sb.uc_gui_press_key()
+    # Plain load first; reconnect + GUI captcha only if a challenge is showing
+    sb.open(fiverr_url())
+    check_challenge(sb, "startup")
+    print("[driver] started. Profile dir:", cfg.profile_dir)
+    # driver.get("https://www.fiverr.com/")
+    time.sleep(2)
+    load_cookies(sb.driver)
+    # Hook WebSocket before the dashboard's own scripts run
+    from keeper_keepalive import install_keepalive
+    install_keepalive(sb.driver)
+    sb.get(cfg.fiverr_dash)
+
+    time.sleep(1)
+    log_keepalive(sb.driver)
+    save_screenshot(sb.driver, "startup")
+
+    # From here on the dashboard tab is never navigated; polling happens in the worker tab
+    tabs = TabManager(sb.driver, cfg.fiverr_dash, on_dashboard=install_keepalive)
+    tabs.adopt_dashboard()
+
+    try:
+        n, m = get_unread_counts(sb.driver)
+        print("[init] notif:", n, "msgs:", m)
+    except Exception as e:
+        save_screenshot(sb.driver, "initial_check_failed")
+        raise Exception("Initial unread check failed: " + repr(e))
+
+    status.update(notif=n, msgs=m, last_poll=time.time(), last_ok=time.time())
+    write_status_file()
+
+
+def poll_loop(sb, recovery):
+    global last_alert_unreads
+    last_refresh = time.time()
+    # Last poll that succeeded before the current one; None until this session polled once
+    # (and again after a pause)
+    prev_ok = None
+    # Bound before the first iteration so the error handler always has a config
+    cfg = config.current
+
+    while True:
+        try:
+            config.maybe_reload()
+            cfg = config.current
+            recovery.set_tiers(cfg.recovery_tiers)
+            recovery.max_wait = cfg.poll_error_sleep
+            tabs.ensure()
+            tabs.worker()
+            status["tabs"] = tabs.summary()
+            handle_screenshot_requests(sb.driver)
+            if not resume_event.is_set():
+                # Unreads that arrive during a pause aren't timed from the pre-pause poll
+                prev_ok = None
+                wait_for_next_poll(cfg.heartbeat_interval)
+                continue
+
+            poll_started = status["last_poll"] = time.time()
+            n, m = get_unread_counts(sb.driver)
+            # Counts read off an unsolved challenge page are garbage: fail the poll instead
+            if check_challenge(sb, "poll", raise_unresolved=True):
+                n, m = get_unread_counts(sb.driver)
+            total = n + m
+            print("[poll] notif:", n, "msgs:", m, "total:", total)
+            if recovery.on_success() is not None:
+                status["recovery"] = recovery.summary()
+            msgs_rose = status["msgs"] is not None and m > status["msgs"]
+            status.update(notif=n, msgs=m, last_ok=time.time(), last_error=None, consecutive_errors=0)
+
+            if total == 0 and last_alert_unreads != 0:
+                print("[tracker] all read -> reset last_alert_unreads")
+                last_alert_unreads = 0
+
+            if total > last_alert_unreads:
+                subject = "Fiverr: New notifications/messages"
+                body = f"Unread Notifications: {n}\nUnread Messages: {m}\nTotal: {total}\nTime: {time.ctime()}"
+                deliver_unread_alert(subject, body, prev_ok, poll_started, msgs_rose, cfg)
+                last_alert_unreads = total
+            prev_ok = poll_started
+
+            write_status_file()
+            run_collector(sb.driver, cfg)
+            run_cookie_sync(sb.driver, cfg)
+
+            if time.time() - last_refresh >= cfg.refresh_interval_hours * 3600:
+                print("[refresh] refreshing dashboard to keep WS alive")
+                tabs.dashboard_url = cfg.fiverr_dash
+                try:
+                    tabs.dashboard().get(cfg.fiverr_dash)
+                except Exception as e:
+                    print("[refresh] dashboard tab unresponsive, replacing:", e)
+                    tabs.replace_dashboard()
+                    tabs.dashboard()
+                time.sleep(4)
+                log_keepalive(sb.driver)
+                save_screenshot(sb.driver, "refresh")
+                tabs.worker()
+                last_refresh = time.time()
+
+            wait_for_next_poll(cfg.heartbeat_interval)
+        except RestartDriver:
+            raise
+        except Exception as inner:
+            status["last_error"] = repr(inner)[:200]
+            status["consecutive_errors"] += 1
+            write_status_file()
+            print("[loop error]", inner)
+            if status["consecutive_errors"] == 1:
+                save_screenshot(sb.driver, "poll_error")
+                traceback.print_exc()
+            if cfg.error_alert_after and status["consecutive_errors"] == cfg.error_alert_after:
+                send_email_notification("Fiverr Keeper: poll failing",
+                                        f"{status['consecutive_errors']} consecutive poll errors.\nLast: {inner!r}")
+                notify_telegram(f"Fiverr Keeper: {status['consecutive_errors']} consecutive poll errors: {inner!r}")
+            # Skip a second UC attempt when the poll already failed on an unsolved challenge
+            if not isinstance(inner, ChallengeUnresolved) and check_challenge(sb, "poll_error"):
+                continue
+            recovery.on_failure(inner)
+            status["recovery"] = recovery.summary()
+
+
+# ----------------------------------------------------------
+# Recovery tiers (see keeper_recovery)
+# ----------------------------------------------------------
+def restart_driver():
+    raise RestartDriver()
+
+
+def recovery_actions(sb):
+    """Tab-level tiers act on the worker tab only; the dashboard tab keeps its presence."""
+    return {
+        "retry": lambda: time.sleep(0.5),
+        "reload": lambda: tabs.worker().refresh(),
+        "new_tab": lambda: tabs.replace_worker(),
+        "reinject_cookies": lambda: load_cookies(tabs.worker()),
+        "restart_driver": restart_driver,
+    }
+
+
+# ----------------------------------------------------------
+# CLI
+# ----------------------------------------------------------
+ONE_SHOT_COMMANDS = ("check-once", "status", "test-alert", "validate-config", "latency")
+SECRET_FIELDS = ("smtp_password", "telegram_bot_token")
+
+
+def load_config_or_exit():
+    try:
+        return config.current
+    except ConfigError as e:
+        print("[config] invalid configuration:")
+        for err in e.errors:
+            print("   -", err)
+        sys.exit(2)
+
+
+def cmd_check_once(args):
+    cfg = load_config_or_exit()
+    # Same profile and debugging port as `run`: a second Chrome would fight it for both
+    if is_process_running("fiverr_keeper_sb.py", exclude=ONE_SHOT_COMMANDS):
+        print("A keeper is running on this profile; use `status` instead of `check-once`.")
+        sys.exit(1)
+    with open_browser(cfg) as sb:
+        sb.open(fiverr_url())
+        check_challenge(sb, "startup")
+        load_cookies(sb.driver)
+        n, m = get_unread_counts(sb.driver)
+    print("notif:", n, "msgs:", m, "total:", n + m)
+
+
+def cmd_status(args):
+    cfg = load_config_or_exit()
+    try:
+        with open(cfg.status_file, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError) as e:
+        print("No status available:", e)
+        sys.exit(1)
+    print(format_status(snapshot))
+    print(f"Status written {int(time.time() - snapshot.get('written', 0))}s ago by pid {snapshot.get('pid')}")
+
+
+def cmd_test_alert(args):
+    load_config_or_exit()
+    body = f"Test alert from Fiverr Keeper\nTime: {time.ctime()}"
+    send_email_notification("Fiverr Keeper: test alert", body)
+    notify_telegram(body)
+
+
+def cmd_validate_config(args):
+    from dataclasses import asdict
+
+    cfg = load_config_or_exit()
+    print("[config] OK:", config.path)
+    for name, value in asdict(cfg).items():
+        if name in SECRET_FIELDS and value:
+            value = "***"
+        print(f"   {name.upper()} = {value!r}")
+
+
+def cmd_latency(args):
+    from keeper_latency import read_records, summarize, format_summary
+
+    cfg = load_config_or_exit()
+    records = read_records(cfg.latency_file, args.last or cfg.latency_window)
+    if not records:
+        print("No latency records in", cfg.latency_file)
+        sys.exit(1)
+    print(f"Last {len(records)} alerts from {cfg.latency_file}")
+    print(format_summary(summarize(records, cfg.latency_slo_seconds)))
+
+
+def cli(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="fiverr_keeper_sb.py", description="Fiverr keeper")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("run", help="run the keeper (default)")
+    sub.add_parser("check-once", help="open the browser, print unread counts, exit")
+    sub.add_parser("status", help="show the running keeper's cached status")
+    sub.add_parser("test-alert", help="send a test email/Telegram alert")
+    sub.add_parser("validate-config", help="validate .env / KEEPER_CONFIG_FILE")
+    latency_parser = sub.add_parser("latency", help="alert latency percentiles")
+    latency_parser.add_argument("--last", type=int, default=0, help="records to include (default LATENCY_WINDOW)")
+    args = parser.parse_args(argv)
+
+    commands = {
+        "check-once": cmd_check_once,
+        "status": cmd_status,
+        "test-alert": cmd_test_alert,
+        "validate-config": cmd_validate_config,
+        "latency": cmd_latency,
+    }
+    commands.get(args.command, lambda _: main())(args)
+
+
 if __name__ == "__main__":
-    main()
+    cli()
@@ -18,36 +18,39 @@ from email.message import EmailMessage
 from bs4 import BeautifulSoup
 from selenium.common.exceptions import WebDriverException
 from dotenv import load_dotenv
+from keeper_config import load_config
 
 # ----------------------------------------------------------
 # Load environment
 # ----------------------------------------------------------
 load_dotenv()
+# This keeper has always used its own profile directory by default
+cfg = load_config(profile_dir=os.path.expanduser("~/.config/fiverr_profile"))
 
-COOKIES_FILE = os.getenv("COOKIES_FILE", "cookies.json")
-FIVERR_DASH = os.getenv("FIVERR_DASH", "https://www.fiverr.com/seller_dashboard")
+COOKIES_FILE = cfg.cookies_file
+FIVERR_DASH = cfg.fiverr_dash
 NOTIF_URL = "https://www.fiverr.com/notification_items/unread_count"
 INBOX_URL = "https://www.fiverr.com/inbox/counters/unread"
 
-HEADLESS = os.getenv("HEADLESS", "true").lower() in ("1", "true", "yes", "y")
-HEARTBEAT_INTERVAL = int(os.getenv("HEARTBEAT_INTERVAL", "10"))
-REFRESH_INTERVAL_HOURS = int(os.getenv("REFRESH_INTERVAL_HOURS", "3"))
-PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.expanduser("~/.config/fiverr_profile"))
-SCREENSHOT_DIR = os.getenv("SCREENSHOT_DIR", "./screenshots")
+HEADLESS = cfg.headless
+HEARTBEAT_INTERVAL = cfg.heartbeat_interval
+REFRESH_INTERVAL_HOURS = cfg.refresh_interval_hours
+PROFILE_DIR = cfg.profile_dir
+SCREENSHOT_DIR = cfg.screenshot_dir
 
 # Email config
-SMTP_HOST = os.getenv("SMTP_HOST")
-SMTP_PORT = os.getenv("SMTP_PORT")
-SMTP_FROM = os.getenv("SMTP_FROM")
-SMTP_TO = os.getenv("SMTP_TO")
-SMTP_USER = os.getenv("SMTP_USER")
-SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
-SMTP_USE_SSL = os.getenv("SMTP_USE_SSL", "true").lower() in ("1", "true", "yes", "y")
-SMTP_USE_TLS = os.getenv("SMTP_USE_TLS", "false").lower() in ("1", "true", "yes", "y")
+SMTP_HOST = cfg.smtp_host
+SMTP_PORT = cfg.smtp_port
+SMTP_FROM = cfg.smtp_from
+SMTP_TO = cfg.smtp_to
+SMTP_USER = cfg.smtp_user
+SMTP_PASSWORD = cfg.smtp_password
+SMTP_USE_SSL = cfg.smtp_use_ssl
+SMTP_USE_TLS = cfg.smtp_use_tls
 
 # Telegram (optional)
-TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
-TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+TELEGRAM_BOT_TOKEN = cfg.telegram_bot_token
+TELEGRAM_CHAT_ID = cfg.telegram_chat_id
 
 last_alert_unreads = 0
 
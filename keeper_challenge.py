@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Bot-challenge detection for the Fiverr keeper
+- One execute_script checks the URL, title and DOM for PerimeterX / Turnstile markers
+- The expensive UC reconnect + GUI captcha handling only runs when a marker is found
+- ChallengeStats records how often each path was taken and how long it took
+"""
+
+import time
+
+# Returns the first matching marker name, or null when the page looks clean
+DETECT_JS = """
+const markers = [
+    ['px-captcha', () => document.getElementById('px-captcha')],
+    ['px-block', () => /\\/(blocked|px-captcha)/i.test(location.pathname)],
+    ['turnstile-iframe', () => document.querySelector('iframe[src*="challenges.cloudflare.com"]')],
+    ['turnstile-widget', () => document.querySelector('.cf-turnstile, #challenge-form, #cf-challenge-running')],
+    ['access-denied', () => /access to this page has been denied|just a moment|verify you are human/i.test(document.title)],
+];
+for (const [name, test] of markers) {
+    try { if (test()) return name; } catch (e) {}
+}
+return null;
+"""
+
+
+def detect_challenge(driver):
+    """Marker name if the current page is a challenge, else None. Never raises."""
+    try:
+        return driver.execute_script(DETECT_JS)
+    except Exception as e:
+        print("[challenge] detection failed:", e)
+        return None
+
+
+class ChallengeUnresolved(Exception):
+    """A challenge is still showing after UC handling; left to the recovery ladder."""
+
+
+class ChallengeStats:
+    """Per-path counters and timings: 'clean' (skipped), 'handled' or 'unresolved'."""
+
+    def __init__(self):
+        self.paths = {}
+
+    def record(self, path, seconds, marker=None):
+        entry = self.paths.setdefault(path, {"count": 0, "total": 0.0, "max": 0.0, "markers": {}})
+        entry["count"] += 1
+        entry["total"] += seconds
+        entry["max"] = max(entry["max"], seconds)
+        if marker:
+            entry["markers"][marker] = entry["markers"].get(marker, 0) + 1
+
+    def summary(self):
+        parts = []
+        for path, e in sorted(self.paths.items()):
+            avg = e["total"] / e["count"]
+            parts.append(f"{path}={e['count']} (avg {avg:.2f}s, max {e['max']:.2f}s)")
+        return ", ".join(parts) or "no checks yet"
+
+
+def ensure_no_challenge(sb, url, stats, where, reconnect_time=4):
+    """
+    Check the current page and solve a challenge only if one is showing.
+    Returns the marker that was handled, or None when the page was clean.
+    UC handling errors are logged, not raised; ChallengeUnresolved is raised
+    only when the challenge is still showing afterwards.
+    """
+    start = time.time()
+    marker = detect_challenge(sb.driver)
+    if not marker:
+        stats.record(f"{where}:clean", time.time() - start)
+        return None
+
+    print(f"[challenge] {marker} detected at {where}, running UC handling")
+    try:
+        sb.uc_open_with_reconnect(url, reconnect_time)
+        sb.uc_gui_handle_captcha()
+    except Exception as e:
+        print("[challenge] UC handling failed:", e)
+    elapsed = time.time() - start
+    remaining = detect_challenge(sb.driver)
+    stats.record(f"{where}:{'unresolved' if remaining else 'handled'}", elapsed, marker)
+    print(f"[challenge] handling took {elapsed:.1f}s, still present: {remaining}")
+    if remaining:
+        raise ChallengeUnresolved(f"{remaining} still showing at {where} after {elapsed:.1f}s")
+    return marker
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Batched seller-dashboard collector
+- Fetches the configured endpoints (COLLECTOR_ENDPOINTS) in one concurrent
+  in-page fetch() from whatever fiverr.com page is loaded: no navigation
+- Hashes each payload and skips unchanged ones
+- Appends only deltas to COLLECTOR_DELTA_FILE, keeps the last payloads in COLLECTOR_STATE_FILE
+- Alerts on order state changes and new reviews
+"""
+
+import hashlib
+import json
+import time
+
+from keeper_config import write_json_atomic
+
+FETCH_TIMEOUT_MS = 20000
+
+# All endpoints in flight at once; one round trip through webdriver
+BATCH_FETCH_JS = """
+const [endpoints, timeoutMs, done] = arguments;
+Promise.all(endpoints.map(([name, url]) => {
+    const ctl = new AbortController();
+    const timer = setTimeout(() => ctl.abort(), timeoutMs);
+    return fetch(url, {credentials: 'include', headers: {'Accept': 'application/json'}, signal: ctl.signal})
+        .then(r => r.text().then(body => ({name: name, status: r.status, body: body})))
+        .catch(e => ({name: name, status: 0, error: String(e)}))
+        .finally(() => clearTimeout(timer));
+})).then(done, e => done([{name: '*', status: 0, error: String(e)}]));
+"""
+
+STATUS_KEYS = ("status", "state", "order_status")
+
+
+def payload_hash(payload):
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+def json_delta(old, new, path=""):
+    """Flat {dotted.path: [old, new]} of changed leaves; list items keyed by id when present."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        delta = {}
+        for key in set(old) | set(new):
+            delta.update(json_delta(old.get(key), new.get(key), f"{path}.{key}" if path else str(key)))
+        return delta
+    if isinstance(old, list) and isinstance(new, list):
+        def keyed(items):
+            if all(isinstance(i, dict) and "id" in i for i in items):
+                return {str(i["id"]): i for i in items}
+            return {str(n): i for n, i in enumerate(items)}
+        return json_delta(keyed(old), keyed(new), path)
+    if old != new:
+        return {path or "$": [old, new]}
+    return {}
+
+
+def find_records(payload):
+    """First list of dicts carrying an `id`, searched breadth-first."""
+    pending = [payload]
+    while pending:
+        node = pending.pop(0)
+        if isinstance(node, list):
+            if node and all(isinstance(i, dict) and "id" in i for i in node):
+                return node
+            pending.extend(node)
+        elif isinstance(node, dict):
+            pending.extend(node.values())
+    return []
+
+
+def record_status(record):
+    for key in STATUS_KEYS:
+        if key in record:
+            return record[key]
+    return None
+
+
+def order_changes(old, new):
+    before = {str(r["id"]): record_status(r) for r in find_records(old)}
+    changes = []
+    for record in find_records(new):
+        oid = str(record["id"])
+        state = record_status(record)
+        if oid not in before:
+            changes.append(f"New order {oid}: {state}")
+        elif before[oid] != state:
+            changes.append(f"Order {oid}: {before[oid]} -> {state}")
+    return changes
+
+
+def new_reviews(old, new):
+    seen = {str(r["id"]) for r in find_records(old)}
+    return [f"New review {r['id']}" + (f" ({r['rating']}*)" if "rating" in r else "")
+            for r in find_records(new) if str(r["id"]) not in seen]
+
+
+# Endpoint name -> function(old_payload, new_payload) -> alert lines
+ALERT_RULES = {
+    "orders": order_changes,
+    "reviews": new_reviews,
+}
+
+
+class DashboardCollector:
+    """Runs on its own (slow) schedule from the poll loop; alert(subject, body) delivers alerts."""
+
+    def __init__(self, alert):
+        self.alert = alert
+        self.state = None
+        self.last_run = 0.0
+
+    def due(self, cfg):
+        if not (cfg.collector_interval_minutes and cfg.collector_endpoints):
+            return False
+        return time.time() - self.last_run >= cfg.collector_interval_minutes * 60
+
+    def _load_state(self, path):
+        if self.state is None:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.state = json.load(f)
+            except (OSError, ValueError):
+                self.state = {}
+        return self.state
+
+    def fetch(self, driver, cfg):
+        endpoints = [[name, cfg.fiverr_base + path] for name, path in cfg.collector_endpoints]
+        return driver.execute_async_script(BATCH_FETCH_JS, endpoints, FETCH_TIMEOUT_MS)
+
+    def collect(self, driver, cfg):
+        self.last_run = time.time()
+        state = self._load_state(cfg.collector_state_file)
+        start = time.time()
+        results = self.fetch(driver, cfg)
+
+        changed = 0
+        alerts = []
+        with open(cfg.collector_delta_file, "a", encoding="utf-8") as deltas:
+            for result in results:
+                name = result["name"]
+                if result.get("status") != 200:
+                    print(f"[collector] {name}: status {result.get('status')} {result.get('error', '')}")
+                    continue
+                try:
+                    payload = json.loads(result["body"])
+                except ValueError:
+                    print(f"[collector] {name}: response is not JSON, skipped")
+                    continue
+
+                digest = payload_hash(payload)
+                previous = state.get(name)
+                if previous and previous["hash"] == digest:
+                    continue
+
+                changed += 1
+                if previous:
+                    delta = json_delta(previous["payload"], payload)
+                    rule = ALERT_RULES.get(name)
+                    if rule:
+                        alerts.extend(rule(previous["payload"], payload))
+                else:
+                    delta = {"$": [None, "baseline"]}
+                deltas.write(json.dumps({"ts": self.last_run, "name": name, "delta": delta}) + "\n")
+                state[name] = {"hash": digest, "payload": payload, "ts": self.last_run}
+
+        if changed:
+            write_json_atomic(cfg.collector_state_file, state)
+        print(f"[collector] {len(results)} endpoints in {time.time() - start:.2f}s, {changed} changed")
+
+        if alerts:
+            body = "\n".join(alerts) + f"\nTime: {time.ctime()}"
+            self.alert("Fiverr: dashboard changes", body)
+        return alerts
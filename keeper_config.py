@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Typed, validated configuration for the Fiverr keepers
+- One parser for every setting (both keeper scripts used to disagree on types)
+- Loaded from a .env-style file (KEEPER_CONFIG_FILE); the process environment wins
+  for anything it sets, as load_dotenv() always did
+- ConfigManager reloads on SIGHUP or when the file changes, without touching Chrome
+- Invalid values are rejected and the last good config stays active
+"""
+
+import json
+import os
+import signal
+import threading
+from dataclasses import dataclass, fields, replace
+from typing import Optional, Tuple
+
+DEFAULT_CONFIG_FILE = ".env"
+
+
+class ConfigError(ValueError):
+    """Raised with every problem found while validating a config source."""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        super().__init__("; ".join(self.errors))
+
+
+# ----------------------------------------------------------
+# Value parsers
+# ----------------------------------------------------------
+def _bool(raw):
+    value = raw.strip().lower()
+    if value in ("1", "true", "yes", "y", "on"):
+        return True
+    if value in ("0", "false", "no", "n", "off", ""):
+        return False
+    raise ValueError(f"expected a boolean, got {raw!r}")
+
+
+def _str(raw):
+    return raw.strip() or None
+
+
+def _positive(kind):
+    def parse(raw):
+        value = kind(raw.strip())
+        if value <= 0:
+            raise ValueError(f"must be > 0, got {raw!r}")
+        return value
+    return parse
+
+
+def _non_negative(kind):
+    def parse(raw):
+        value = kind(raw.strip())
+        if value < 0:
+            raise ValueError(f"must be >= 0, got {raw!r}")
+        return value
+    return parse
+
+
+def _names(raw):
+    names = tuple(n.strip() for n in raw.split(",") if n.strip())
+    if not names:
+        raise ValueError("at least one name is required")
+    return names
+
+
+RECOVERY_TIER_NAMES = ("retry", "reload", "new_tab", "reinject_cookies", "restart_driver")
+
+
+def _recovery_tiers(raw):
+    """'retry:3:0,reload:2:30,...' -> (("retry", 3, 0.0), ("reload", 2, 30.0), ...)"""
+    tiers = []
+    for item in raw.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        parts = item.split(":")
+        if len(parts) != 3 or parts[0] not in RECOVERY_TIER_NAMES:
+            raise ValueError(f"expected tier:attempts:cooldown with tier in {RECOVERY_TIER_NAMES}, got {item!r}")
+        attempts, cooldown = int(parts[1]), float(parts[2])
+        if attempts < 1 or cooldown < 0:
+            raise ValueError(f"attempts must be >= 1 and cooldown >= 0 in {item!r}")
+        tiers.append((parts[0], attempts, cooldown))
+    if not tiers:
+        raise ValueError("at least one tier is required")
+    return tuple(tiers)
+
+
+def _endpoints(raw):
+    """'orders=/path,reviews=/other' -> (("orders", "/path"), ("reviews", "/other"))"""
+    pairs = []
+    for item in raw.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, sep, path = item.partition("=")
+        name, path = name.strip(), path.strip()
+        if not (sep and name and path.startswith("/")):
+            raise ValueError(f"expected name=/path, got {item!r}")
+        pairs.append((name, path))
+    return tuple(pairs)
+
+
+def _port(raw):
+    raw = raw.strip()
+    if not raw:
+        return None
+    value = int(raw)
+    if not 0 < value < 65536:
+        raise ValueError(f"not a valid port: {raw!r}")
+    return value
+
+
+# ----------------------------------------------------------
+# Schema
+# ----------------------------------------------------------
+@dataclass(frozen=True)
+class KeeperConfig:
+    # Browser (changes need a browser restart, see RESTART_REQUIRED)
+    headless: bool = True
+    profile_dir: str = os.path.expanduser("~/.config/fiverr_profiles")
+
+    # Paths / URLs
+    cookies_file: str = "cookies.json"
+    fiverr_base: str = "https://www.fiverr.com"
+    fiverr_dash: str = "https://www.fiverr.com/seller_dashboard"
+    screenshot_dir: str = "./screenshots"
+
+    # Intervals and thresholds
+    heartbeat_interval: float = 10.0
+    refresh_interval_hours: float = 3.0
+    poll_error_sleep: float = 10.0
+    error_alert_after: int = 0  # consecutive poll errors before alerting, 0 = never
+
+    # Recovery ladder: (tier, attempts per incident, cooldown seconds), cheapest first
+    recovery_tiers: Tuple[Tuple[str, int, float], ...] = (
+        ("retry", 3, 0.0),
+        ("reload", 2, 30.0),
+        ("new_tab", 1, 60.0),
+        ("reinject_cookies", 1, 300.0),
+        ("restart_driver", 1, 600.0),
+    )
+
+    # Dashboard collector (disabled until endpoints are configured)
+    collector_interval_minutes: float = 15.0  # 0 = off
+    collector_endpoints: Tuple[Tuple[str, str], ...] = ()
+    collector_state_file: str = "dashboard_state.json"
+    collector_delta_file: str = "dashboard_deltas.jsonl"
+
+    # Cookie write-back (COOKIES_FILE); the names that trigger a write are fnmatch
+    # patterns. PerimeterX cookies (_px3 etc.) rotate every few minutes and would
+    # churn through the generations, so they are saved along with the rest of the
+    # jar but don't trigger a write themselves.
+    cookie_sync_minutes: float = 10.0  # 0 = off
+    cookie_sync_names: Tuple[str, ...] = (
+        "_fiverr_session_key", "hodor_creds", "access_token", "forterToken",
+        "_cfuvid", "cf_clearance",
+    )
+    cookie_sync_generations: int = 5
+
+    # Alert latency accounting
+    latency_file: str = "latency.jsonl"
+    latency_window: int = 200
+    latency_slo_seconds: float = 60.0
+
+    # Status snapshot for `fiverr_keeper_sb.py status`
+    status_file: str = "keeper_status.json"
+
+    # Email
+    smtp_host: Optional[str] = None
+    smtp_port: Optional[int] = None
+    smtp_from: Optional[str] = None
+    smtp_to: Optional[str] = None
+    smtp_user: Optional[str] = None
+    smtp_password: Optional[str] = None
+    smtp_use_ssl: bool = True
+    smtp_use_tls: bool = False
+
+    # Telegram
+    telegram_bot_token: Optional[str] = None
+    telegram_chat_id: Optional[str] = None
+    telegram_api_base: str = "https://api.telegram.org"
+    telegram_commands: bool = True
+
+    @property
+    def smtp_configured(self):
+        return bool(self.smtp_host and self.smtp_port and self.smtp_from and self.smtp_to)
+
+    @property
+    def telegram_configured(self):
+        return bool(self.telegram_bot_token and self.telegram_chat_id)
+
+
+# Environment variable -> parser; the attribute is the lower-cased name
+PARSERS = {
+    "HEADLESS": _bool,
+    "PROFILE_DIR": lambda raw: os.path.expanduser(raw.strip()),
+    "COOKIES_FILE": str.strip,
+    "FIVERR_BASE": lambda raw: raw.strip().rstrip("/"),
+    "FIVERR_DASH": str.strip,
+    "SCREENSHOT_DIR": str.strip,
+    "HEARTBEAT_INTERVAL": _positive(float),
+    "REFRESH_INTERVAL_HOURS": _positive(float),
+    "POLL_ERROR_SLEEP": _positive(float),
+    "ERROR_ALERT_AFTER": _non_negative(int),
+    "RECOVERY_TIERS": _recovery_tiers,
+    "COLLECTOR_INTERVAL_MINUTES": _non_negative(float),
+    "COLLECTOR_ENDPOINTS": _endpoints,
+    "COLLECTOR_STATE_FILE": str.strip,
+    "COLLECTOR_DELTA_FILE": str.strip,
+    "COOKIE_SYNC_MINUTES": _non_negative(float),
+    "COOKIE_SYNC_NAMES": _names,
+    "COOKIE_SYNC_GENERATIONS": _non_negative(int),
+    "LATENCY_FILE": str.strip,
+    "LATENCY_WINDOW": _positive(int),
+    "LATENCY_SLO_SECONDS": _positive(float),
+    "STATUS_FILE": str.strip,
+    "SMTP_HOST": _str,
+    "SMTP_PORT": _port,
+    "SMTP_FROM": _str,
+    "SMTP_TO": _str,
+    "SMTP_USER": _str,
+    "SMTP_PASSWORD": _str,
+    "SMTP_USE_SSL": _bool,
+    "SMTP_USE_TLS": _bool,
+    "TELEGRAM_BOT_TOKEN": _str,
+    "TELEGRAM_CHAT_ID": _str,
+    "TELEGRAM_API_BASE": str.strip,
+    "TELEGRAM_COMMANDS": _bool,
+}
+
+# Settings that only take effect when Chrome is relaunched
+RESTART_REQUIRED = frozenset({"headless", "profile_dir"})
+
+
+def parse_config(values, **defaults):
+    """Build a KeeperConfig from a name -> raw string mapping, or raise ConfigError.
+
+    `defaults` override KeeperConfig's own defaults for settings absent from `values`.
+    """
+    parsed = {}
+    errors = []
+    for name, parser in PARSERS.items():
+        raw = values.get(name)
+        if raw is None:
+            continue
+        try:
+            parsed[name.lower()] = parser(raw)
+        except ValueError as e:
+            errors.append(f"{name}: {e}")
+
+    # SMTP_USE_SSL defaults to on; asking for STARTTLS alone means plain SMTP + STARTTLS
+    if parsed.get("smtp_use_tls") and "smtp_use_ssl" not in parsed:
+        parsed["smtp_use_ssl"] = False
+    if errors:
+        raise ConfigError(errors)
+
+    # Email problems only disable email, they never stop the keeper
+    cfg = replace(KeeperConfig(**defaults), **parsed)
+    if cfg.smtp_use_ssl and cfg.smtp_use_tls:
+        print("[config] warning: SMTP_USE_SSL and SMTP_USE_TLS both set, using SSL")
+    if cfg.smtp_host and not cfg.smtp_port:
+        print("[config] warning: SMTP_HOST is set without SMTP_PORT, email alerts are off")
+    return cfg
+
+
+def read_sources(path=None, environ=None):
+    """
+    Config file values with the process environment on top, like load_dotenv():
+    a variable exported at startup always wins, file edits apply to the rest.
+    """
+    from dotenv import dotenv_values
+
+    environ = dict(os.environ if environ is None else environ)
+    values = {}
+    path = path or os.getenv("KEEPER_CONFIG_FILE", DEFAULT_CONFIG_FILE)
+    if path and os.path.exists(path):
+        try:
+            file_values = dotenv_values(path)
+        except (OSError, UnicodeDecodeError) as e:
+            # Unreadable or not UTF-8: same as an invalid value, keep the last good config
+            raise ConfigError([f"{path}: {e}"])
+        values = {k: v for k, v in file_values.items() if v is not None}
+        shadowed = sorted(k for k, v in values.items() if k in PARSERS and k in environ and environ[k] != v)
+        if shadowed:
+            print(f"[config] environment overrides {path} for:", ", ".join(shadowed))
+    values.update(environ)
+    return values
+
+
+def load_config(path=None, **defaults):
+    return parse_config(read_sources(path), **defaults)
+
+
+def write_json_atomic(path, data):
+    """Write JSON via a temp file + rename so readers never see a partial file."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def diff_configs(old, new):
+    return {f.name for f in fields(KeeperConfig) if getattr(old, f.name) != getattr(new, f.name)}
+
+
+class ConfigManager:
+    """
+    Holds the active KeeperConfig and swaps it atomically on reload.
+
+    The keeper calls maybe_reload() once per poll: it costs one stat() unless
+    SIGHUP was received or the file's mtime moved. Listeners get
+    (old, new, changed_names) after a successful reload. `wake` (an Event) is
+    set on SIGHUP so a sleeping poll loop picks the reload up right away.
+    """
+
+    def __init__(self, path=None, wake=None):
+        self.path = path or os.getenv("KEEPER_CONFIG_FILE", DEFAULT_CONFIG_FILE)
+        self._environ = dict(os.environ)
+        self._current = None
+        self._mtime = None
+        self._reload_requested = threading.Event()
+        self.wake = wake
+        self.listeners = []
+
+    @property
+    def current(self):
+        if self._current is None:
+            self._mtime = self._file_mtime()
+            self._current = parse_config(read_sources(self.path, self._environ))
+        return self._current
+
+    def _file_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def request_reload(self, *_):
+        # Signal-handler safe: the actual reload happens on the main thread
+        self._reload_requested.set()
+        if self.wake is not None:
+            self.wake.set()
+
+    def file_changed(self):
+        return self._file_mtime() != self._mtime
+
+    def install_sighup(self):
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(signal.SIGHUP, self.request_reload)
+
+    def maybe_reload(self):
+        mtime = self._file_mtime()
+        if not self._reload_requested.is_set() and mtime == self._mtime:
+            return False
+        self._reload_requested.clear()
+        self._mtime = mtime
+        return self.reload()
+
+    def reload(self):
+        old = self.current
+        try:
+            new = parse_config(read_sources(self.path, self._environ))
+        except ConfigError as e:
+            print("[config] reload rejected, keeping previous config:")
+            for err in e.errors:
+                print("   -", err)
+            return False
+
+        changed = diff_configs(old, new)
+        if not changed:
+            print("[config] reloaded, no changes")
+            return False
+
+        self._current = new
+        live = sorted(changed - RESTART_REQUIRED)
+        pending = sorted(changed & RESTART_REQUIRED)
+        if live:
+            print("[config] applied live:", ", ".join(n.upper() for n in live))
+        if pending:
+            print("[config] needs browser restart to apply:", ", ".join(n.upper() for n in pending))
+        for listener in self.listeners:
+            try:
+                listener(old, new, changed)
+            except Exception as e:
+                print("[config] listener failed:", e)
+        return True
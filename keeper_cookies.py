@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Session cookie write-back for the Fiverr keeper
+- Reads the browser jar over CDP (Network.getAllCookies) every COOKIE_SYNC_MINUTES
+- Diffs it against the last saved snapshot by (name, domain) -> value hash
+- Rewrites cookies.json only when a security-relevant cookie (COOKIE_SYNC_NAMES) changed,
+  via temp file + rename, keeping COOKIE_SYNC_GENERATIONS older copies and the file mode
+- A jar without the session cookie (logged out) is never written
+- inject_cookies() restores a jar with one Network.setCookies call, no navigation
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import shutil
+import stat
+import time
+
+# Browser-extension export format used by cookies.json <-> CDP
+SAMESITE_TO_CDP = {"lax": "Lax", "strict": "Strict", "no_restriction": "None"}
+SAMESITE_FROM_CDP = {v: k for k, v in SAMESITE_TO_CDP.items()}
+
+# Without it the jar is logged out and must not replace a working cookies.json
+SESSION_COOKIE = "_fiverr_session_key"
+
+
+def value_hash(value):
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def fingerprint(cookies):
+    """(name, domain) -> value hash; values themselves are never kept or logged."""
+    return {(c["name"], c.get("domain", "")): value_hash(c.get("value", "")) for c in cookies}
+
+
+def is_relevant(name, patterns):
+    return any(fnmatch.fnmatchcase(name, p) for p in patterns)
+
+
+def relevant_changes(old_fp, new_fp, patterns):
+    """Sorted names of security-relevant cookies added, removed or changed."""
+    changed = set()
+    for key in set(old_fp) | set(new_fp):
+        if old_fp.get(key) != new_fp.get(key) and is_relevant(key[0], patterns):
+            changed.add(key[0])
+    return sorted(changed)
+
+
+# ----------------------------------------------------------
+# Format conversion
+# ----------------------------------------------------------
+def from_cdp(cookie):
+    exported = {
+        "name": cookie["name"],
+        "value": cookie["value"],
+        "domain": cookie["domain"],
+        "path": cookie.get("path", "/"),
+        "hostOnly": not cookie["domain"].startswith("."),
+        "httpOnly": cookie.get("httpOnly", False),
+        "secure": cookie.get("secure", False),
+        "session": cookie.get("session", False),
+        "sameSite": SAMESITE_FROM_CDP.get(cookie.get("sameSite"), "unspecified"),
+    }
+    if not exported["session"] and cookie.get("expires", -1) > 0:
+        exported["expirationDate"] = cookie["expires"]
+    return exported
+
+
+def to_cdp(cookie):
+    param = {
+        "name": cookie["name"],
+        "value": cookie.get("value", ""),
+        "path": cookie.get("path") or "/",
+        "secure": bool(cookie.get("secure")),
+        "httpOnly": bool(cookie.get("httpOnly")),
+    }
+    domain = cookie.get("domain", "")
+    if cookie.get("hostOnly"):
+        # Host-only cookies must be set by URL, a domain would widen them
+        param["url"] = f"https://{domain.lstrip('.')}{param['path']}"
+    else:
+        param["domain"] = domain
+    same_site = SAMESITE_TO_CDP.get(str(cookie.get("sameSite")).lower())
+    if same_site:
+        param["sameSite"] = same_site
+    expires = cookie.get("expirationDate", cookie.get("expiry", cookie.get("expires")))
+    if expires and not cookie.get("session"):
+        param["expires"] = float(expires)
+    return param
+
+
+def inject_cookies(driver, cookies):
+    """Whole jar in one CDP call; works before any fiverr.com page is open."""
+    driver.execute_cdp_cmd("Network.setCookies", {"cookies": [to_cdp(c) for c in cookies]})
+
+
+# ----------------------------------------------------------
+# Atomic, generational write
+# ----------------------------------------------------------
+def rotate_generations(path, generations):
+    """
+    cookies.json.1 -> ... -> cookies.json.N (oldest dropped), then cookies.json is
+    linked (or copied) to .1. cookies.json itself never goes missing.
+    """
+    if generations <= 0 or not os.path.exists(path):
+        return
+    for n in range(generations - 1, 0, -1):
+        older = f"{path}.{n}"
+        if os.path.exists(older):
+            os.replace(older, f"{path}.{n + 1}")
+    try:
+        os.link(path, f"{path}.1")
+    except OSError:
+        shutil.copy2(path, f"{path}.1")
+
+
+def write_cookies_atomic(path, cookies, generations):
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp = os.path.join(directory, f".{os.path.basename(path)}.tmp")
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        mode = 0o600  # session secrets
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        os.fchmod(f.fileno(), mode)  # O_CREAT mode is filtered by the umask
+        json.dump(cookies, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    rotate_generations(path, generations)
+    os.replace(tmp, path)
+
+
+class CookieSync:
+    """Periodic jar write-back, driven from the poll loop."""
+
+    def __init__(self):
+        self.snapshot = None
+        self.last_run = 0.0
+        self.writes = 0
+
+    def due(self, cfg):
+        return bool(cfg.cookie_sync_minutes) and time.time() - self.last_run >= cfg.cookie_sync_minutes * 60
+
+    def _load_snapshot(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return fingerprint(json.load(f))
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _on_site(domain, site):
+        domain = domain.lstrip(".")
+        return domain == site or domain.endswith("." + site)
+
+    def sync(self, driver, cfg):
+        """Returns the changed cookie names that triggered a write, or []."""
+        self.last_run = time.time()
+        if self.snapshot is None:
+            self.snapshot = self._load_snapshot(cfg.cookies_file)
+
+        jar = driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+        domain = cfg.fiverr_base.split("://", 1)[-1].split("/")[0].split(":")[0]
+        site = domain[4:] if domain.startswith("www.") else domain
+        jar = [c for c in jar if self._on_site(c.get("domain", ""), site)]
+
+        current = fingerprint(jar)
+        changed = relevant_changes(self.snapshot, current, cfg.cookie_sync_names)
+        if not changed:
+            return []
+        if not any(c["name"] == SESSION_COOKIE for c in jar):
+            print(f"[cookies] {SESSION_COOKIE} missing from the browser (logged out?), not saving")
+            return []
+
+        write_cookies_atomic(cfg.cookies_file, [from_cdp(c) for c in jar], cfg.cookie_sync_generations)
+        self.snapshot = current
+        self.writes += 1
+        print(f"[cookies] saved {len(jar)} cookies to {cfg.cookies_file}, changed: {', '.join(changed)}")
+        return changed
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+WebSocket keepalive for the Fiverr dashboard
+- Installed with CDP Page.addScriptToEvaluateOnNewDocument, so it runs before page scripts
+- Wraps the WebSocket constructor and keeps a registry of live sockets
+  (closure-held sockets included, no `for (k in window)` scan)
+- Pings only open sockets and reports socket count/state back to Python
+- Renderer CPU helpers used to compare against the old window-scanning script
+"""
+
+import os
+import time
+
+import psutil
+
+KEEPALIVE_INTERVAL_MS = 50000
+
+# Placeholder replaced with the interval so the script stays a plain string for CDP
+KEEPALIVE_JS = """
+(() => {
+    if (window.__fiverrKeepalive || !window.WebSocket) return;
+    const NativeWebSocket = window.WebSocket;
+    const live = new Set();
+    const stats = {created: 0, closed: 0, pings: 0, lastPing: 0, errors: 0};
+
+    window.WebSocket = new Proxy(NativeWebSocket, {
+        construct(target, args, newTarget) {
+            const ws = Reflect.construct(target, args, newTarget);
+            live.add(ws);
+            stats.created++;
+            ws.addEventListener('close', () => { live.delete(ws); stats.closed++; });
+            return ws;
+        }
+    });
+
+    setInterval(() => {
+        live.forEach(ws => {
+            if (ws.readyState !== 1) return;
+            try { ws.send('ping'); stats.pings++; } catch (e) { stats.errors++; }
+        });
+        stats.lastPing = Date.now();
+    }, __INTERVAL__);
+
+    Object.defineProperty(window, '__fiverrKeepalive', {
+        enumerable: false,
+        value: {
+            stats() {
+                const states = [0, 0, 0, 0];
+                live.forEach(ws => states[ws.readyState]++);
+                return Object.assign({
+                    sockets: live.size,
+                    connecting: states[0], open: states[1], closing: states[2],
+                    urls: Array.from(live, ws => ws.url),
+                    now: Date.now(),
+                }, stats);
+            }
+        }
+    });
+})();
+"""
+
+# The script main() used to inject; kept for the CPU comparison in bench/keepalive_cpu.py
+LEGACY_KEEPALIVE_JS = """
+setInterval(() => {
+    if (window.WebSocket) {
+        const sockets = [];
+        for (let k in window) {
+            if (window[k] instanceof WebSocket) sockets.push(window[k]);
+        }
+        sockets.forEach(s => {
+            if (s.readyState === 1) s.send('ping');
+        });
+    }
+}, __INTERVAL__);
+"""
+
+
+def keepalive_source(interval_ms=KEEPALIVE_INTERVAL_MS, legacy=False):
+    script = LEGACY_KEEPALIVE_JS if legacy else KEEPALIVE_JS
+    return script.replace("__INTERVAL__", str(int(interval_ms)))
+
+
+def install_keepalive(driver, interval_ms=KEEPALIVE_INTERVAL_MS):
+    """
+    Register the hook for every future document in the current tab and run it
+    on the current one too. Sockets the current page opened before this call
+    are not tracked until its next load, so install before opening the dashboard.
+    """
+    source = keepalive_source(interval_ms)
+    result = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+    try:
+        driver.execute_script(source)
+    except Exception as e:
+        print("[keepalive] current document not hooked:", e)
+    print("[keepalive] installed, interval:", interval_ms // 1000, "s")
+    return result.get("identifier")
+
+
+def keepalive_stats(driver):
+    """Socket registry snapshot from the current tab, or None if the hook is missing."""
+    stats = driver.execute_script(
+        "return window.__fiverrKeepalive ? window.__fiverrKeepalive.stats() : null;"
+    )
+    if stats and stats.get("lastPing"):
+        stats["last_ping_age"] = round((stats["now"] - stats["lastPing"]) / 1000.0, 1)
+    return stats
+
+
+def format_keepalive(stats):
+    if not stats:
+        return "hook missing"
+    return (f"sockets={stats['sockets']} open={stats['open']} "
+            f"connecting={stats['connecting']} pings={stats['pings']}")
+
+
+# ----------------------------------------------------------
+# Renderer CPU measurement
+# ----------------------------------------------------------
+def renderer_processes(root_pid=None):
+    """Chrome renderer processes below this Python process (or root_pid)."""
+    try:
+        children = psutil.Process(root_pid or os.getpid()).children(recursive=True)
+    except psutil.Error:
+        return []
+    procs = []
+    for proc in children:
+        try:
+            if "--type=renderer" in " ".join(proc.cmdline()):
+                procs.append(proc)
+        except psutil.Error:
+            continue
+    return procs
+
+
+def renderer_cpu_seconds(root_pid=None):
+    total = 0.0
+    for proc in renderer_processes(root_pid):
+        try:
+            times = proc.cpu_times()
+            total += times.user + times.system
+        except psutil.Error:
+            continue
+    return total
+
+
+def page_script_seconds(driver):
+    """CDP Performance metrics for the current tab: (ScriptDuration, TaskDuration)."""
+    driver.execute_cdp_cmd("Performance.enable", {})
+    metrics = driver.execute_cdp_cmd("Performance.getMetrics", {}).get("metrics", [])
+    values = {m["name"]: m["value"] for m in metrics}
+    return values.get("ScriptDuration", 0.0), values.get("TaskDuration", 0.0)
+
+
+def measure_renderer_cpu(driver, seconds):
+    """Renderer CPU and page script time spent over a `seconds` window."""
+    cpu0 = renderer_cpu_seconds()
+    script0, task0 = page_script_seconds(driver)
+    start = time.time()
+    time.sleep(seconds)
+    elapsed = time.time() - start
+    cpu1 = renderer_cpu_seconds()
+    script1, task1 = page_script_seconds(driver)
+    return {
+        "elapsed": elapsed,
+        "renderer_cpu": cpu1 - cpu0,
+        "renderer_cpu_pct": 100.0 * (cpu1 - cpu0) / elapsed,
+        "script": script1 - script0,
+        "task": task1 - task0,
+    }
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Alert latency accounting for the Fiverr keeper
+- observed: when the unread became observable (the inbox payload's message
+  timestamp when messages rose and it falls between the two polls, otherwise
+  the last poll that did not see it yet)
+- detected: the poll that saw the counter go up
+- accepted: when each channel (email, telegram) accepted the alert, plus send duration
+- Rolling percentiles in the logs; records appended to LATENCY_FILE for `latency`
+"""
+
+import json
+import math
+import time
+from collections import deque
+from datetime import datetime
+
+TIMESTAMP_KEYS = ("last_message_at", "last_message_time", "updated_at", "created_at", "timestamp")
+
+
+def message_timestamp(payload):
+    """Epoch seconds from a counter payload, if it carries a usable timestamp."""
+    if not isinstance(payload, dict):
+        return None
+    for key in TIMESTAMP_KEYS:
+        value = payload.get(key)
+        if value is None:
+            continue
+        try:
+            if isinstance(value, (int, float)):
+                return value / 1000.0 if value > 1e11 else float(value)
+            return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            continue
+    return None
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile; None for an empty list."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def metrics_of(record):
+    """Flatten one alert record into metric name -> seconds."""
+    observed, detected = record["observed"], record["detected"]
+    out = {"detect": detected - observed}
+    for name, ch in record["channels"].items():
+        out[f"{name}.send"] = ch["duration"]
+        if ch["ok"]:
+            out[f"{name}.deliver"] = ch["accepted"] - detected
+            out[f"{name}.e2e"] = ch["accepted"] - observed
+    accepted = [ch["accepted"] for ch in record["channels"].values() if ch["ok"]]
+    if accepted:
+        out["e2e"] = min(accepted) - observed
+    return out
+
+
+def summarize(records, slo_seconds):
+    series = {}
+    for record in records:
+        for name, value in metrics_of(record).items():
+            series.setdefault(name, []).append(value)
+    summary = {}
+    for name, values in sorted(series.items()):
+        summary[name] = {
+            "n": len(values),
+            "p50": percentile(values, 50),
+            "p90": percentile(values, 90),
+            "p99": percentile(values, 99),
+            "max": max(values),
+        }
+    e2e = series.get("e2e", [])
+    summary["slo"] = {
+        "seconds": slo_seconds,
+        "within": sum(1 for v in e2e if v <= slo_seconds),
+        "n": len(e2e),
+    }
+    return summary
+
+
+def format_summary(summary):
+    lines = [f"{'metric':<16} {'n':>5} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}"]
+    for name, s in summary.items():
+        if name == "slo":
+            continue
+        lines.append(f"{name:<16} {s['n']:>5} {s['p50']:>8.2f} {s['p90']:>8.2f} {s['p99']:>8.2f} {s['max']:>8.2f}")
+    slo = summary["slo"]
+    if slo["n"]:
+        pct = 100.0 * slo["within"] / slo["n"]
+        lines.append(f"SLO e2e <= {slo['seconds']:.0f}s: {slo['within']}/{slo['n']} ({pct:.1f}%)")
+    return "\n".join(lines)
+
+
+def read_records(path, limit):
+    records = deque(maxlen=limit)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return list(records)
+
+
+class LatencyTracker:
+    """One record per alert; keeps a rolling window in memory and appends to a JSONL file."""
+
+    def __init__(self):
+        self.window = deque(maxlen=200)
+
+    def begin(self, observed, detected, source):
+        return {"observed": observed, "detected": detected, "source": source, "channels": {}}
+
+    def channel(self, record, name, start, ok):
+        end = time.time()
+        record["channels"][name] = {"accepted": end, "duration": end - start, "ok": bool(ok)}
+
+    def finish(self, record, cfg):
+        if self.window.maxlen != cfg.latency_window:
+            self.window = deque(self.window, maxlen=cfg.latency_window)
+        self.window.append(record)
+        try:
+            with open(cfg.latency_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print("[latency] write failed:", e)
+
+        m = metrics_of(record)
+        parts = [f"{k}={v:.2f}s" for k, v in sorted(m.items())]
+        print("[latency]", record["source"], " ".join(parts))
+        e2e = summarize(self.window, cfg.latency_slo_seconds).get("e2e")
+        if e2e:
+            print(f"[latency] rolling e2e p50={e2e['p50']:.2f}s p90={e2e['p90']:.2f}s "
+                  f"p99={e2e['p99']:.2f}s over {e2e['n']}")
+        return m
+
+    def short_summary(self, cfg):
+        e2e = summarize(self.window, cfg.latency_slo_seconds).get("e2e")
+        if not e2e:
+            return None
+        return f"e2e p50 {e2e['p50']:.1f}s, p90 {e2e['p90']:.1f}s over {e2e['n']} alerts"
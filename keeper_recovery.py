@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tiered recovery for poll failures
+- retry -> reload -> new_tab -> reinject_cookies -> restart_driver
+- Each tier has its own attempt budget (per incident) and cooldown (between runs)
+- Time-to-recover is recorded against the highest tier the incident reached
+- restart_driver raises RestartDriver; main() relaunches Chrome on the same profile
+"""
+
+import time
+from collections import namedtuple
+
+from keeper_config import RECOVERY_TIER_NAMES as TIER_NAMES
+
+# Defaults and the RECOVERY_TIERS format live in keeper_config
+Tier = namedtuple("Tier", "name attempts cooldown")
+
+
+class RestartDriver(Exception):
+    """Raised by the last tier; main() tears down SB and starts it again."""
+
+
+class RecoveryManager:
+    """
+    on_failure() picks and runs the next tier for the current incident;
+    on_success() closes the incident. actions maps tier name -> callable().
+    Only a tier whose attempts are used up is escalated past: if the cheapest
+    remaining tier is cooling down, its wait is slept (capped at max_wait) and
+    the poll is simply retried.
+    """
+
+    def __init__(self, tiers, actions, max_wait=10.0):
+        self.actions = actions
+        self.max_wait = max_wait
+        self.last_run = {}
+        self.stats = {name: {"runs": 0, "failed": 0, "recoveries": 0, "ttr_total": 0.0, "ttr_max": 0.0}
+                      for name in TIER_NAMES}
+        self.set_tiers(tiers)
+        self._reset_incident()
+
+    def set_tiers(self, tiers):
+        """(name, attempts, cooldown) tuples, e.g. from RECOVERY_TIERS; applied live."""
+        self.tiers = tuple(Tier(*t) for t in tiers)
+
+    def _reset_incident(self):
+        self.incident_start = None
+        self.failures = 0
+        self.used = {}
+        self.top_tier = None
+
+    def _next_tier(self, now):
+        for tier in self.tiers:
+            if self.used.get(tier.name, 0) >= tier.attempts:
+                continue
+            remaining = tier.cooldown - (now - self.last_run.get(tier.name, float("-inf")))
+            if remaining <= 0:
+                return tier, 0.0
+            # Cheaper tier still cooling down: wait for it rather than escalate
+            return None, remaining
+        return None, self.max_wait
+
+    def on_failure(self, error):
+        now = time.time()
+        if self.incident_start is None:
+            self.incident_start = now
+        self.failures += 1
+
+        tier, wait = self._next_tier(now)
+        if tier is None:
+            wait = min(wait, self.max_wait)
+            print(f"[recovery] next tier cooling down or ladder used up, waiting {wait:.0f}s")
+            time.sleep(wait)
+            # A fresh budget once the whole ladder has been walked
+            if all(self.used.get(t.name, 0) >= t.attempts for t in self.tiers):
+                self.used = {}
+            return None
+
+        self.used[tier.name] = self.used.get(tier.name, 0) + 1
+        self.last_run[tier.name] = now
+        if self.top_tier is None or TIER_NAMES.index(tier.name) > TIER_NAMES.index(self.top_tier):
+            self.top_tier = tier.name
+        stats = self.stats[tier.name]
+        stats["runs"] += 1
+        print(f"[recovery] failure #{self.failures} ({error!r:.120}), tier: {tier.name}")
+
+        start = time.time()
+        try:
+            self.actions[tier.name]()
+        except RestartDriver:
+            raise
+        except Exception as e:
+            stats["failed"] += 1
+            print(f"[recovery] {tier.name} failed: {e!r:.200}")
+        print(f"[recovery] {tier.name} took {time.time() - start:.2f}s")
+        return tier.name
+
+    def on_success(self):
+        if self.incident_start is None:
+            return None
+        ttr = time.time() - self.incident_start
+        tier = self.top_tier
+        if tier:
+            stats = self.stats[tier]
+            stats["recoveries"] += 1
+            stats["ttr_total"] += ttr
+            stats["ttr_max"] = max(stats["ttr_max"], ttr)
+        print(f"[recovery] recovered after {self.failures} failure(s) in {ttr:.2f}s via {tier or 'wait'}")
+        self._reset_incident()
+        return ttr
+
+    def restart_done(self):
+        """Driver relaunched: the incident continues, but tab/cookie tiers get a new budget."""
+        self.used = {"restart_driver": self.used.get("restart_driver", 0)}
+
+    def summary(self):
+        parts = []
+        for name, s in self.stats.items():
+            if not s["runs"]:
+                continue
+            avg = s["ttr_total"] / s["recoveries"] if s["recoveries"] else 0.0
+            parts.append(f"{name}: {s['runs']} runs, {s['recoveries']} recovered "
+                         f"(ttr avg {avg:.2f}s, max {s['ttr_max']:.2f}s)")
+        return "; ".join(parts) or "no failures"
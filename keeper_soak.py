@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Soak test for the Fiverr keeper
+- Serves a local stand-in for the Fiverr home/dashboard/counter endpoints
+- Runs fiverr_keeper_sb.py against it at an accelerated poll/refresh interval
+- Samples the whole process tree (Python, chromedriver, Chrome) with psutil:
+  RSS, open fds, threads, process count, zombies and orphaned Chrome processes
+- Reports growth slopes per hour and exits 1 when a threshold is exceeded or the
+  keeper died before the run finished
+
+    python keeper_soak.py --minutes 120 --heartbeat 1 --sample 15
+
+Stop any production keeper first: the keeper refuses to start twice and
+always binds --remote-debugging-port=9222.
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import psutil
+
+from keeper_config import PARSERS
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+KEEPER = os.path.join(HERE, "fiverr_keeper_sb.py")
+
+DASHBOARD_HTML = b"""<html><head><title>Seller Dashboard (soak stub)</title></head>
+<body><h1>dashboard</h1><script>
+for (let i = 0; i < 2000; i++) { window['soak' + i] = {i: i}; }
+</script></body></html>"""
+
+
+# ----------------------------------------------------------
+# Local stand-in for the Fiverr endpoints
+# ----------------------------------------------------------
+class StubHandler(BaseHTTPRequestHandler):
+    started = time.time()
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        # Counters cycle so the alert and "all read" paths are exercised too
+        tick = int(time.time() - self.started) // 30
+        if path == "/notification_items/unread_count":
+            self._send(json.dumps({"count": tick % 3}).encode(), "application/json")
+        elif path == "/inbox/counters/unread":
+            self._send(json.dumps({"count": (tick // 2) % 2}).encode(), "application/json")
+        else:
+            self._send(DASHBOARD_HTML, "text/html")
+
+
+def start_stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, name="soak-stub", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def write_soak_config(base, profile_dir, heartbeat, refresh_hours, workdir):
+    """Soak-only config: alerts stay off and the keeper's output files land in
+    workdir, not next to the real keeper's. main() strips keeper settings from
+    the child's environment so this file is the only source."""
+    path = os.path.join(workdir, "soak.env")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join([
+            f"FIVERR_BASE={base}",
+            f"FIVERR_DASH={base}/seller_dashboard",
+            f"PROFILE_DIR={profile_dir}",
+            f"COOKIES_FILE={os.path.join(workdir, 'no_cookies.json')}",
+            f"SCREENSHOT_DIR={os.path.join(workdir, 'screenshots')}",
+            f"LATENCY_FILE={os.path.join(workdir, 'latency.jsonl')}",
+            f"STATUS_FILE={os.path.join(workdir, 'keeper_status.json')}",
+            f"COLLECTOR_STATE_FILE={os.path.join(workdir, 'dashboard_state.json')}",
+            f"COLLECTOR_DELTA_FILE={os.path.join(workdir, 'dashboard_deltas.jsonl')}",
+            f"HEARTBEAT_INTERVAL={heartbeat}",
+            f"REFRESH_INTERVAL_HOURS={refresh_hours}",
+            "POLL_ERROR_SLEEP=1",
+            "SMTP_HOST=",
+            "TELEGRAM_BOT_TOKEN=",
+            "TELEGRAM_COMMANDS=false",
+            "",
+        ]))
+    return path
+
+
+# ----------------------------------------------------------
+# Sampling
+# ----------------------------------------------------------
+def role_of(proc):
+    try:
+        cmd = " ".join(proc.cmdline())
+        name = proc.name().lower()
+    except psutil.Error:
+        return "gone"
+    if "chromedriver" in name or "chromedriver" in cmd:
+        return "chromedriver"
+    if "--type=renderer" in cmd:
+        return "renderer"
+    if "chrome" in name or "chromium" in name:
+        return "chrome"
+    if "python" in name:
+        return "python"
+    return "other"
+
+
+def find_orphans(profile_dir, tree_pids):
+    """Chrome/chromedriver processes using the soak profile that left the keeper's tree."""
+    orphans = []
+    for proc in psutil.process_iter(["pid", "cmdline"]):
+        if proc.pid in tree_pids:
+            continue
+        cmd = " ".join(proc.info.get("cmdline") or [])
+        if profile_dir in cmd and ("chrome" in cmd or "chromedriver" in cmd):
+            orphans.append(proc.pid)
+    return orphans
+
+
+def sample_tree(root, profile_dir):
+    try:
+        procs = [root] + root.children(recursive=True)
+    except psutil.Error:
+        procs = []
+    sample = {"t": time.time(), "rss_mb": 0.0, "fds": 0, "threads": 0, "procs": 0, "zombies": 0, "by_role": {}}
+    for proc in procs:
+        try:
+            with proc.oneshot():
+                if proc.status() == psutil.STATUS_ZOMBIE:
+                    sample["zombies"] += 1
+                    continue
+                rss = proc.memory_info().rss / (1024 * 1024)
+                fds = proc.num_fds() if hasattr(proc, "num_fds") else proc.num_handles()
+                threads = proc.num_threads()
+        except psutil.Error:
+            continue
+        role = role_of(proc)
+        sample["rss_mb"] += rss
+        sample["fds"] += fds
+        sample["threads"] += threads
+        sample["procs"] += 1
+        by_role = sample["by_role"].setdefault(role, {"rss_mb": 0.0, "procs": 0})
+        by_role["rss_mb"] += rss
+        by_role["procs"] += 1
+    sample["orphans"] = len(find_orphans(profile_dir, {p.pid for p in procs}))
+    return sample
+
+
+# ----------------------------------------------------------
+# Report
+# ----------------------------------------------------------
+def slope_per_hour(samples, key):
+    """Least-squares slope of samples[key] against time, in units per hour."""
+    if len(samples) < 2:
+        return 0.0
+    xs = [s["t"] for s in samples]
+    ys = [s[key] for s in samples]
+    mx = sum(xs) / len(xs)
+    my = sum(ys) / len(ys)
+    var = sum((x - mx) ** 2 for x in xs)
+    if not var:
+        return 0.0
+    cov = sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+    return cov / var * 3600
+
+
+def build_report(samples, warmup, limits, exit_orphans, early_exit=None):
+    """early_exit: the keeper's return code if it died before the deadline."""
+    steady = [s for s in samples if s["t"] - samples[0]["t"] >= warmup] if samples else []
+    report = {"samples": len(samples), "steady_samples": len(steady), "metrics": {}, "leaks": [], "failures": []}
+    if early_exit is not None:
+        report["failures"].append(f"keeper exited early with code {early_exit}, run aborted")
+    for key in ("rss_mb", "fds", "threads", "procs"):
+        slope = slope_per_hour(steady, key)
+        first = steady[0][key] if steady else 0
+        last = steady[-1][key] if steady else 0
+        report["metrics"][key] = {"first": first, "last": last, "slope_per_hour": slope, "limit": limits[key]}
+        if len(steady) >= 3 and slope > limits[key]:
+            report["leaks"].append(f"{key} grows {slope:.2f}/h (limit {limits[key]})")
+    max_zombies = max((s["zombies"] for s in samples), default=0)
+    max_orphans = max((s["orphans"] for s in samples), default=0)
+    report["metrics"]["zombies_max"] = max_zombies
+    report["metrics"]["orphans_max"] = max_orphans
+    report["metrics"]["orphans_after_exit"] = exit_orphans
+    if max_zombies > limits["zombies"]:
+        report["leaks"].append(f"{max_zombies} zombie children (limit {limits['zombies']})")
+    if max(max_orphans, exit_orphans) > limits["orphans"]:
+        report["leaks"].append(f"{max(max_orphans, exit_orphans)} orphaned Chrome processes (limit {limits['orphans']})")
+    return report
+
+
+def print_report(report):
+    print("\n[soak] report")
+    print(f"{'metric':<10} {'first':>10} {'last':>10} {'slope/h':>10} {'limit/h':>10}")
+    for key in ("rss_mb", "fds", "threads", "procs"):
+        m = report["metrics"][key]
+        print(f"{key:<10} {m['first']:>10.1f} {m['last']:>10.1f} {m['slope_per_hour']:>10.2f} {m['limit']:>10.2f}")
+    print("zombies max:", report["metrics"]["zombies_max"],
+          "| orphans max:", report["metrics"]["orphans_max"],
+          "| orphans after exit:", report["metrics"]["orphans_after_exit"])
+    if report["failures"]:
+        print("[soak] FAILED:")
+        for failure in report["failures"]:
+            print("   -", failure)
+    if report["leaks"]:
+        print("[soak] LEAKS:")
+        for leak in report["leaks"]:
+            print("   -", leak)
+    elif not report["failures"]:
+        print("[soak] no leaks past thresholds")
+
+
+def stop_keeper(proc, timeout=60):
+    """SIGINT so main()'s finally quits the driver, then escalate."""
+    if proc.poll() is not None:
+        return
+    proc.send_signal(signal.SIGINT)
+    try:
+        proc.wait(timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak-test the keeper for leaks")
+    parser.add_argument("--minutes", type=float, default=60)
+    parser.add_argument("--heartbeat", type=float, default=1, help="keeper poll interval (s)")
+    parser.add_argument("--refresh-minutes", type=float, default=2, help="dashboard refresh interval")
+    parser.add_argument("--sample", type=float, default=10, help="sampling interval (s)")
+    parser.add_argument("--warmup", type=float, default=120, help="seconds ignored for slopes")
+    parser.add_argument("--max-rss-slope", type=float, default=20, help="MB per hour")
+    parser.add_argument("--max-fd-slope", type=float, default=10, help="fds per hour")
+    parser.add_argument("--max-thread-slope", type=float, default=5, help="threads per hour")
+    parser.add_argument("--max-proc-slope", type=float, default=1, help="processes per hour")
+    parser.add_argument("--max-zombies", type=int, default=0)
+    parser.add_argument("--max-orphans", type=int, default=0)
+    parser.add_argument("--report", default="soak_report.json")
+    args = parser.parse_args()
+
+    limits = {
+        "rss_mb": args.max_rss_slope,
+        "fds": args.max_fd_slope,
+        "threads": args.max_thread_slope,
+        "procs": args.max_proc_slope,
+        "zombies": args.max_zombies,
+        "orphans": args.max_orphans,
+    }
+
+    server, base = start_stub()
+    workdir = tempfile.mkdtemp(prefix="fiverr_soak_")
+    profile_dir = os.path.join(workdir, "profile")
+    # Exported keeper settings would win over soak.env; the soak run gets only its own
+    env = {k: v for k, v in os.environ.items() if k not in PARSERS}
+    env["KEEPER_CONFIG_FILE"] = write_soak_config(
+        base, profile_dir, args.heartbeat, args.refresh_minutes / 60.0, workdir)
+    log_path = os.path.join(workdir, "keeper.log")
+    print("[soak] stub:", base, "| workdir:", workdir)
+
+    samples = []
+    with open(log_path, "w", encoding="utf-8") as log:
+        keeper = subprocess.Popen([sys.executable, KEEPER], cwd=HERE, env=env, stdout=log, stderr=subprocess.STDOUT)
+        root = psutil.Process(keeper.pid)
+        deadline = time.time() + args.minutes * 60
+        early_exit = None
+        try:
+            while time.time() < deadline:
+                if keeper.poll() is not None:
+                    early_exit = keeper.returncode
+                    print("[soak] keeper exited early with", early_exit, "- see", log_path)
+                    break
+                sample = sample_tree(root, profile_dir)
+                samples.append(sample)
+                print(f"[soak] rss={sample['rss_mb']:.0f}MB fds={sample['fds']} threads={sample['threads']} "
+                      f"procs={sample['procs']} zombies={sample['zombies']} orphans={sample['orphans']}")
+                time.sleep(args.sample)
+        finally:
+            stop_keeper(keeper)
+            time.sleep(3)
+            exit_orphans = len(find_orphans(profile_dir, set()))
+            server.shutdown()
+
+    report = build_report(samples, args.warmup, limits, exit_orphans, early_exit)
+    report["samples_data"] = samples
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print_report(report)
+    print("[soak] full report:", args.report, "| keeper log:", log_path)
+    sys.exit(1 if report["leaks"] or report["failures"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Dual-tab layout for the Fiverr keeper
+- Presence tab: the seller dashboard (WebSocket + keepalive hook), never navigated away
+- Worker tab: counter fetches, collector requests and recovery actions
+- Each tab is checked and rebuilt on its own, so losing one never resets the other
+"""
+
+
+class TabManager:
+    """
+    Owns the two window handles. The driver is left focused on the worker tab;
+    on_dashboard(driver) is called after the dashboard tab is (re)opened, e.g. to
+    install the keepalive hook before the page loads.
+    """
+
+    def __init__(self, driver, dashboard_url, on_dashboard=None):
+        self.driver = driver
+        self.dashboard_url = dashboard_url
+        self.on_dashboard = on_dashboard
+        self.dashboard_handle = None
+        self.worker_handle = None
+        self.rebuilt = {"dashboard": 0, "worker": 0}
+
+    def adopt_dashboard(self):
+        """The current tab already shows the dashboard: keep it and open the worker next to it."""
+        self.dashboard_handle = self.driver.current_window_handle
+        self._open_worker()
+
+    def _open_worker(self):
+        self.driver.switch_to.new_window("tab")
+        self.worker_handle = self.driver.current_window_handle
+        print("[tabs] worker tab:", self.worker_handle)
+
+    def _open_dashboard(self):
+        self.driver.switch_to.new_window("tab")
+        self.dashboard_handle = self.driver.current_window_handle
+        if self.on_dashboard:
+            self.on_dashboard(self.driver)
+        self.driver.get(self.dashboard_url)
+        print("[tabs] dashboard tab:", self.dashboard_handle)
+
+    def _close(self, handle):
+        try:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        except Exception as e:
+            print("[tabs] could not close tab:", e)
+
+    def ensure(self):
+        """Recreate whichever tab disappeared; one window_handles call when both are fine."""
+        handles = self.driver.window_handles
+        lost_dashboard = self.dashboard_handle not in handles
+        lost_worker = self.worker_handle not in handles
+        if (lost_dashboard or lost_worker) and handles:
+            # New Window fails with "no such window" while focus is on a closed tab
+            self.driver.switch_to.window(handles[0])
+        if lost_dashboard:
+            print("[tabs] dashboard tab lost, reopening")
+            self.rebuilt["dashboard"] += 1
+            self._open_dashboard()
+        if lost_worker:
+            print("[tabs] worker tab lost, reopening")
+            self.rebuilt["worker"] += 1
+            self._open_worker()
+
+    def after_reconnect(self):
+        """
+        uc_open_with_reconnect() opens the URL in a new tab, closes the focused one
+        and focuses the new tab. Adopt that tab as the worker if the old worker is
+        gone, close any other stray tab, and restore a missing dashboard.
+        """
+        try:
+            handles = self.driver.window_handles
+            try:
+                current = self.driver.current_window_handle
+            except Exception:
+                current = None
+            if self.worker_handle not in handles and current in handles and current != self.dashboard_handle:
+                print("[tabs] adopting reconnected tab as worker:", current)
+                self.worker_handle = current
+                self.rebuilt["worker"] += 1
+            for handle in handles:
+                if handle not in (self.dashboard_handle, self.worker_handle):
+                    print("[tabs] closing stray tab:", handle)
+                    self._close(handle)
+            self.ensure()
+            self.worker()
+        except Exception as e:
+            print("[tabs] could not restore the tab layout:", e)
+
+    def worker(self):
+        self.driver.switch_to.window(self.worker_handle)
+        return self.driver
+
+    def dashboard(self):
+        self.driver.switch_to.window(self.dashboard_handle)
+        return self.driver
+
+    def replace_worker(self):
+        """Fresh worker tab (recovery tier); the dashboard is untouched."""
+        old = self.worker_handle
+        self._open_worker()
+        self._close(old)
+        self.rebuilt["worker"] += 1
+        return self.worker()
+
+    def replace_dashboard(self):
+        """Fresh dashboard tab when the presence page crashed or hung."""
+        old = self.dashboard_handle
+        self._open_dashboard()
+        self._close(old)
+        self.rebuilt["dashboard"] += 1
+        return self.worker()
+
+    def summary(self):
+        return (f"dashboard rebuilt {self.rebuilt['dashboard']}x, "
+                f"worker rebuilt {self.rebuilt['worker']}x")
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Telegram command interface for the Fiverr keeper
+- Long-polls getUpdates on a background thread (pooled session, offset tracking)
+- Sends replies/photos from a second thread so the poll loop never waits on Telegram
+- Commands: /status, /screenshot, /pause, /resume, /help
+- TELEGRAM_API_BASE can point at a local stub for testing
+"""
+
+import queue
+import threading
+import time
+
+DEFAULT_API_BASE = "https://api.telegram.org"
+
+# getUpdates holds the connection open for up to this many seconds
+LONG_POLL_TIMEOUT = 25
+CONNECT_TIMEOUT = 5
+SEND_TIMEOUT = 15
+
+
+def make_session():
+    """Small pooled session shared by the poller and the sender."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=1)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class TelegramBot:
+    """
+    Background Telegram worker.
+
+    The keeper hands in plain callables; they run on the bot thread and must
+    only touch cheap, cached state (never the webdriver):
+      status_provider() -> str
+      on_screenshot()   -> None   (queue a capture for the main loop)
+      on_pause()        -> None
+      on_resume()       -> None
+    """
+
+    def __init__(self, token, chat_id, status_provider, on_screenshot, on_pause, on_resume,
+                 api_base=None):
+        self.token = token
+        self.chat_id = str(chat_id)
+        self.api_base = (api_base or DEFAULT_API_BASE).rstrip("/")
+        self.status_provider = status_provider
+        self.on_screenshot = on_screenshot
+        self.on_pause = on_pause
+        self.on_resume = on_resume
+
+        self.session = make_session()
+        self.offset = None
+        self.started = time.time()
+        self.outbox = queue.Queue()
+        self._stop = threading.Event()
+        self._threads = []
+        self._after = []
+
+    # ------------------------------------------------------
+    # Telegram API
+    # ------------------------------------------------------
+    def _url(self, method):
+        return f"{self.api_base}/bot{self.token}/{method}"
+
+    def get_updates(self):
+        params = {"timeout": LONG_POLL_TIMEOUT, "allowed_updates": '["message"]'}
+        if self.offset is not None:
+            params["offset"] = self.offset
+        resp = self.session.get(
+            self._url("getUpdates"),
+            params=params,
+            timeout=(CONNECT_TIMEOUT, LONG_POLL_TIMEOUT + 10),
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        if not data.get("ok"):
+            raise RuntimeError(f"getUpdates not ok: {data.get('description')}")
+        updates = data.get("result", [])
+        if updates:
+            # Acknowledge everything we have seen, even updates we ignore
+            self.offset = max(u["update_id"] for u in updates) + 1
+        return updates
+
+    def skip_backlog(self):
+        """Acknowledge commands queued while the keeper was down so they aren't replayed."""
+        resp = self.session.get(
+            self._url("getUpdates"),
+            params={"offset": -1, "timeout": 0},
+            timeout=(CONNECT_TIMEOUT, SEND_TIMEOUT),
+        )
+        resp.raise_for_status()
+        updates = resp.json().get("result", [])
+        if updates:
+            self.offset = updates[-1]["update_id"] + 1
+            print("[telegram] skipped commands sent before startup")
+
+    def send_message(self, text, chat_id=None):
+        resp = self.session.post(
+            self._url("sendMessage"),
+            data={"chat_id": chat_id or self.chat_id, "text": text},
+            timeout=(CONNECT_TIMEOUT, SEND_TIMEOUT),
+        )
+        resp.raise_for_status()
+        return resp
+
+    def send_photo(self, path, caption="", chat_id=None):
+        with open(path, "rb") as f:
+            resp = self.session.post(
+                self._url("sendPhoto"),
+                data={"chat_id": chat_id or self.chat_id, "caption": caption},
+                files={"photo": f},
+                timeout=(CONNECT_TIMEOUT, SEND_TIMEOUT * 2),
+            )
+        resp.raise_for_status()
+        return resp
+
+    # ------------------------------------------------------
+    # Outbox (non-blocking for callers)
+    # ------------------------------------------------------
+    def queue_message(self, text, chat_id=None):
+        self.outbox.put(("text", text, chat_id))
+
+    def queue_photo(self, path, caption="", chat_id=None):
+        self.outbox.put(("photo", (path, caption), chat_id))
+
+    # ------------------------------------------------------
+    # Commands
+    # ------------------------------------------------------
+    def handle_update(self, update):
+        msg = update.get("message") or {}
+        chat_id = str((msg.get("chat") or {}).get("id", ""))
+        text = (msg.get("text") or "").strip()
+        if not text.startswith("/"):
+            return
+        if chat_id != self.chat_id:
+            print("[telegram] ignoring command from chat", chat_id)
+            return
+        if msg.get("date", self.started) < int(self.started):
+            # Backlog that skip_backlog() could not drop
+            print("[telegram] ignoring command sent before startup:", text)
+            return
+
+        # "/status@MyBot arg" -> "/status"
+        command = text.split()[0].split("@")[0].lower()
+        if command == "/status":
+            reply = self.status_provider()
+        elif command == "/screenshot":
+            self.on_screenshot()
+            reply = "Screenshot queued, it will arrive shortly."
+        elif command == "/pause":
+            self.on_pause()
+            reply = "Polling paused. Send /resume to continue."
+        elif command == "/resume":
+            self.on_resume()
+            reply = "Polling resumed."
+        elif command in ("/help", "/start"):
+            reply = "Commands: /status /screenshot /pause /resume"
+        else:
+            reply = f"Unknown command: {command}"
+        self.queue_message(reply, chat_id)
+
+    # ------------------------------------------------------
+    # Threads
+    # ------------------------------------------------------
+    def _poll_loop(self):
+        # A stopped predecessor may still be inside getUpdates; overlapping calls get 409 Conflict
+        for t in self._after:
+            t.join()
+        try:
+            self.skip_backlog()
+        except Exception as e:
+            print("[telegram] could not skip backlog:", e)
+        backoff = 1
+        while not self._stop.is_set():
+            try:
+                for update in self.get_updates():
+                    try:
+                        self.handle_update(update)
+                    except Exception as e:
+                        print("[telegram] command failed:", e)
+                backoff = 1
+            except Exception as e:
+                print("[telegram] getUpdates failed:", e)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 60)
+
+    def _send_loop(self):
+        while not self._stop.is_set():
+            try:
+                kind, payload, chat_id = self.outbox.get(timeout=1)
+            except queue.Empty:
+                continue
+            try:
+                if kind == "photo":
+                    path, caption = payload
+                    self.send_photo(path, caption, chat_id)
+                else:
+                    self.send_message(payload, chat_id)
+            except Exception as e:
+                print("[telegram] send failed:", e)
+
+    def start(self, after=()):
+        """`after`: threads returned by a previous bot's stop(), joined before the first poll."""
+        self._after = list(after)
+        for target, name in ((self._poll_loop, "telegram-poll"), (self._send_loop, "telegram-send")):
+            t = threading.Thread(target=target, name=name, daemon=True)
+            t.start()
+            self._threads.append(t)
+        print("[telegram] command interface started")
+
+    def stop(self):
+        """Signal both threads and return them, so a replacement bot can wait for them."""
+        self._stop.set()
+        self.session.close()
+        return list(self._threads)
+
+
+def format_status(status):
+    """Render the keeper's cached status dict for /status."""
+    now = time.time()
+
+    def ago(ts):
+        return "never" if not ts else f"{int(now - ts)}s ago"
+
+    lines = [
+        "Fiverr Keeper status",
+        f"State: {'paused' if status.get('paused') else 'running'}",
+        f"Unread notifications: {status.get('notif', '?')}",
+        f"Unread messages: {status.get('msgs', '?')}",
+        f"Last poll: {ago(status.get('last_poll'))}",
+        f"Last successful poll: {ago(status.get('last_ok'))}",
+        f"Consecutive errors: {status.get('consecutive_errors', 0)}",
+        f"Uptime: {int(now - status.get('started', now))}s",
+    ]
+    if status.get("keepalive"):
+        lines.append(f"Keepalive: {status['keepalive']}")
+    if status.get("challenges"):
+        lines.append(f"Challenges: {status['challenges']}")
+    if status.get("recovery"):
+        lines.append(f"Recovery: {status['recovery']}")
+    if status.get("tabs"):
+        lines.append(f"Tabs: {status['tabs']}")
+    if status.get("latency"):
+        lines.append(f"Alert latency: {status['latency']}")
+    if status.get("last_error"):
+        lines.append(f"Last error: {status['last_error']}")
+    return "\n".join(lines)